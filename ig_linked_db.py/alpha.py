@@ -1,13 +1,17 @@
 import os
 import csv
-import time
 import random
+import argparse
 import traceback
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 from PIL import Image, ImageDraw, ImageFont
 from nltk.tokenize import sent_tokenize
 import nltk
 from instagrapi import Client
+from text_layout import layout_text
+from render_manifest import RenderManifest, slide_digest
+from uploader import DryRunClient, InstagramSession, TokenBucket, UploadWorker, make_upload_queue
 
 # Download the Punkt tokenizer if needed.
 nltk.download('punkt')
@@ -25,9 +29,12 @@ OUTPUT_DIR = "instagram_testing\\output_images"
 # Instagram Credentials
 INSTAGRAM_USERNAME = "lumina.for.change"
 INSTAGRAM_PASSWORD = "lumina-edu"
+INSTAGRAM_SETTINGS_FILE = "ig_linked_db.py\\instagram_session.json"  # Persisted login session
 
 # Font settings (using Baloo 2)
 FONT_PATH = "ig_linked_db.py\\Baloo_2\\Baloo2-VariableFont_wght.ttf"
+# Title-slide caption and country; if it cannot be loaded they fall back to the regular font
+BOLD_FONT_PATH = "ig_linked_db.py/Baloo_2/static/Baloo2-Bold.ttf"
 FONT_SIZE = 30
 TEXT_COLOR = (0, 0, 0)  # Black text for title slide; use separate colors for caption/country
 
@@ -57,6 +64,18 @@ MARGIN_PERCENTAGE = 30  # Extremely aggressive text compression
 # CSV and posting settings
 MIN_STORIES = 10
 MAX_STORIES = 15
+REQUIRED_COLUMNS = ['Country', 'Story', 'Title', 'Caption']
+
+# Bump when the drawing code changes so every slide is re-rendered on the next run
+RENDER_VERSION = 1
+
+# Upload rate limit: a token bucket refilled at POSTS_PER_MINUTE, holding at most POST_BURST tokens
+POSTS_PER_MINUTE = 4
+POST_BURST = 1
+
+# Batch rendering settings (render-only mode)
+RENDER_WORKERS = os.cpu_count() or 1
+RENDER_CHUNKSIZE = 4  # Stories handed to a worker process at a time
 
 FONT_PATH = "fonts/Baloo2-Regular.ttf"
 TITLE_FONT_SIZE = 40
@@ -67,6 +86,40 @@ TEXT_COLOR = (0, 0, 0)
 TEMP_PREVIEW_DIR = "static/preview_images"
 os.makedirs(TEMP_PREVIEW_DIR, exist_ok=True)
 
+# === RESOURCE CACHE ===
+
+# Fonts are keyed by (path, size) and decoded slide templates by (path, mode).
+# Both live for the lifetime of the process so a batch run parses each TTF and
+# decodes each PNG only once.
+_FONT_CACHE = {}
+_TEMPLATE_CACHE = {}
+
+def get_font(path, size):
+    """
+    Return a cached ImageFont for the given path and size.
+    Raises IOError like ImageFont.truetype if the font cannot be loaded; failures are not cached.
+    """
+    key = (path, size)
+    font = _FONT_CACHE.get(key)
+    if font is None:
+        font = ImageFont.truetype(path, size)
+        _FONT_CACHE[key] = font
+    return font
+
+def get_template(path, mode="RGBA"):
+    """
+    Return a fresh copy of the decoded template image at path, converted to mode.
+    The decoded original stays in the cache, so callers are free to draw on the copy.
+    Raises IOError like Image.open if the file cannot be read.
+    """
+    key = (path, mode)
+    template = _TEMPLATE_CACHE.get(key)
+    if template is None:
+        with Image.open(path) as img:
+            template = img.convert(mode)
+        _TEMPLATE_CACHE[key] = template
+    return template.copy()
+
 # === AESTHETIC FUNCTIONS ===
 
 def draw_wrapped_text(img, text, font, text_color, margin_percentage=MARGIN_PERCENTAGE, custom_margins=None, align="center"):
@@ -95,50 +148,18 @@ def draw_wrapped_text(img, text, font, text_color, margin_percentage=MARGIN_PERC
         left_margin = margin
 
     # Split text into lines that fit within the width
-    lines = []
-    words = text.split()
-    current_line = []
-    
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        bbox = font.getbbox(test_line)
-        line_width = bbox[2] - bbox[0] if bbox else 0
-        
-        if line_width <= max_text_width:
-            current_line.append(word)
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
-    
-    if current_line:
-        lines.append(' '.join(current_line))
-    
-    line_height = font.getbbox("Aj")[3] + LINE_SPACING
-    total_text_height = len(lines) * line_height
+    layout = layout_text(text, font, max_text_width, LINE_SPACING)
     
     if custom_margins:
-        available_height = img_height - (custom_margins['top'] + custom_margins['bottom'])
-        start_y = custom_margins['top'] + (available_height - total_text_height) // 2
+        box_left = custom_margins['left']
+        box_width = img_width - (custom_margins['left'] + custom_margins['right'])
+        box_top = custom_margins['top']
+        box_height = img_height - (custom_margins['top'] + custom_margins['bottom'])
     else:
-        start_y = (img_height - total_text_height) // 2
+        box_left, box_width, box_top, box_height = 0, img_width, 0, img_height
     
-    for i, line in enumerate(lines):
-        bbox = font.getbbox(line)
-        line_width = bbox[2] - bbox[0]
-        if custom_margins:
-            if align == "center":
-                available_width = img_width - (custom_margins['left'] + custom_margins['right'])
-                x = custom_margins['left'] + (available_width - line_width) // 2
-            elif align == "left":
-                x = custom_margins['left']
-        else:
-            if align == "center":
-                x = (img_width - line_width) // 2
-            elif align == "left":
-                x = 0
-        y = start_y + (i * line_height)
-        draw.text((x, y), line, font=font, fill=text_color)
+    for line, origin in zip(layout.lines, layout.line_origins(box_left, box_width, box_top, box_height, align)):
+        draw.text(origin, line, font=font, fill=text_color)
 
 def draw_title_slide(img, title_text, country_text, caption_text, title_font, country_font, caption_font, text_color, color_scheme="orange"):
     """
@@ -151,12 +172,12 @@ def draw_title_slide(img, title_text, country_text, caption_text, title_font, co
     # Load bold font for title (using Baloo2-Bold.ttf) with adjusted size for longer titles
     if len(title_text.split()) >= 5:
         try:
-            title_bold_font = ImageFont.truetype(FONT_PATH,  25)
+            title_bold_font = get_font(FONT_PATH, 25)
         except IOError:
             title_bold_font = title_font
     else:
         try:
-            title_bold_font = ImageFont.truetype(FONT_PATH, TITLE_FONT_SIZE)
+            title_bold_font = get_font(FONT_PATH, TITLE_FONT_SIZE)
         except IOError:
             title_bold_font = title_font
              
@@ -165,7 +186,7 @@ def draw_title_slide(img, title_text, country_text, caption_text, title_font, co
     
     # Load bold version for caption
     try:
-        caption_bold_font = ImageFont.truetype("ig_linked_db.py\\Baloo_2\\Baloo2-Bold.ttf", CAPTION_FONT_SIZE)
+        caption_bold_font = get_font(BOLD_FONT_PATH, CAPTION_FONT_SIZE)
     except IOError:
         caption_bold_font = caption_font
     caption_color = (128, 128, 128)  # gray for caption
@@ -179,7 +200,7 @@ def draw_title_slide(img, title_text, country_text, caption_text, title_font, co
     
     # Load bold version for country text
     try:
-        country_bold_font = ImageFont.truetype("ig_linked_db.py\\Baloo_2\\Baloo2-Bold.ttf", COUNTRY_FONT_SIZE)
+        country_bold_font = get_font(BOLD_FONT_PATH, COUNTRY_FONT_SIZE)
     except IOError:
         country_bold_font = country_font
     
@@ -196,15 +217,37 @@ def draw_title_slide(img, title_text, country_text, caption_text, title_font, co
 
 # === STORY CREATION AND POSTING FUNCTIONS ===
 
-def create_and_post_story(row, story_index):
+def story_fields(row):
     """
-    Create and post a single story carousel to Instagram using CSV row data.
-    The row should contain 'Country', 'Story', 'Title', and 'Caption'.
+    Return (country, story, title, caption) for a CSV row, substituting defaults for missing values.
+    The row may be a pandas Series or a plain dict with the same keys.
     """
     country = row['Country'] if not pd.isna(row['Country']) else "Unknown Country"
     story = row['Story'] if not pd.isna(row['Story']) else "No story provided."
     title = row['Title'] if not pd.isna(row['Title']) else "Default Title"
     caption = row['Caption'] if not pd.isna(row['Caption']) else "Default Caption"
+    return country, story, title, caption
+
+def _slide_inputs(kind, **inputs):
+    """Everything besides the template and font files that determines how a slide looks."""
+    inputs.update({
+        "kind": kind,
+        "render_version": RENDER_VERSION,
+        "text_color": TEXT_COLOR,
+        "line_spacing": LINE_SPACING,
+        "margin_percentage": MARGIN_PERCENTAGE,
+    })
+    return inputs
+
+def render_story(row, story_index, output_dir=OUTPUT_DIR, force=False):
+    """
+    Render the carousel slides for a single story without posting them.
+    Slides are written to output_dir/story_<story_index>/output_*.jpg.
+    A slide whose inputs (text, fonts, template, layout settings) hash to the same digest as
+    the last render is left untouched unless force is set; see render_manifest.py.
+    Returns the list of slide paths in carousel order, or None if the story has no sentences.
+    """
+    country, story, title, caption = story_fields(row)
     
     # Explicitly alternate the color scheme based on the story_index
     if story_index % 2 == 0:
@@ -217,37 +260,36 @@ def create_and_post_story(row, story_index):
         title_file = PURPLE_TITLE_FILE
 
     # Create a unique subdirectory for this story
-    story_dir = os.path.join(OUTPUT_DIR, f"story_{story_index}")
+    story_dir = os.path.join(output_dir, f"story_{story_index}")
     os.makedirs(story_dir, exist_ok=True)
     output_files = []
+    manifest = RenderManifest(story_dir)
+    reused = 0
     
     print(f"\nProcessing story {story_index} from {country} with {color_scheme} theme...")
     
     # --- STEP 1: Create Title Slide ---
-    try:
-        title_img = Image.open(title_file).convert("RGBA")
-    except IOError:
-        raise FileNotFoundError(f"Unable to open image file {title_file}")
-    try:
-        title_font = ImageFont.truetype(FONT_PATH, TITLE_FONT_SIZE)
-        country_font = ImageFont.truetype(FONT_PATH, COUNTRY_FONT_SIZE)
-        caption_font = ImageFont.truetype(FONT_PATH, CAPTION_FONT_SIZE)
-    except IOError:
-        raise FileNotFoundError(f"Font file {FONT_PATH} not found.")
-    
-    draw_title_slide(title_img, title, country, caption, title_font, country_font, caption_font, TEXT_COLOR, color_scheme)
-    
-    # Save title slide
     title_output_path = os.path.join(story_dir, "output_title.jpg")
-    title_img.convert("RGB").save(title_output_path, format="JPEG")
+    title_digest = slide_digest(
+        _slide_inputs("title", title=title, country=country, caption=caption, color_scheme=color_scheme,
+                      sizes=[TITLE_FONT_SIZE, COUNTRY_FONT_SIZE, CAPTION_FONT_SIZE],
+                      positions=[TITLE_X, TITLE_Y, CAPTION_Y, COUNTRY_X, COUNTRY_Y]),
+        files=[title_file, FONT_PATH, BOLD_FONT_PATH],
+    )
+    if not force and manifest.is_current(title_output_path, title_digest):
+        reused += 1
+    else:
+        _render_title_slide(title_output_path, title_file, title, country, caption, color_scheme)
+        manifest.record(title_output_path, title_digest)
+        print(f"Saved title image for story {story_index}")
     output_files.append(title_output_path)
-    print(f"Saved title image for story {story_index}")
     
     # --- STEP 2: Create Content Slides ---
     sentences = sent_tokenize(story)
     if not sentences:
+        manifest.save()
         print(f"Warning: No sentences found for story {story_index}; skipping.")
-        return False
+        return None
 
     # If there are more than 10 sentences, only use the first 10 and set a flag to add an ellipsis slide.
     add_ellipsis_slide = False
@@ -255,102 +297,232 @@ def create_and_post_story(row, story_index):
         sentences = sentences[:10]
         add_ellipsis_slide = True
 
-    for idx, sentence in enumerate(sentences, start=1):
-        try:
-            content_img = Image.open(slide_file).convert("RGBA")
-        except IOError:
-            raise FileNotFoundError(f"Unable to open image file {slide_file}")
-        try:
-            content_font = ImageFont.truetype(FONT_PATH, FONT_SIZE)
-        except IOError:
-            raise FileNotFoundError(f"Font file {FONT_PATH} not found.")
-        
-        draw_wrapped_text(content_img, sentence, content_font, TEXT_COLOR, MARGIN_PERCENTAGE)
-        content_output_path = os.path.join(story_dir, f"output_{idx}.jpg")
-        content_img.convert("RGB").save(content_output_path, format="JPEG")
-        output_files.append(content_output_path)
-
-    # If more than 10 sentences, add an extra slide with a large, bold ellipsis ("...")
+    slides = [(f"output_{idx}.jpg", _slide_inputs("content", text=sentence, size=FONT_SIZE))
+              for idx, sentence in enumerate(sentences, start=1)]
     if add_ellipsis_slide:
+        slides.append((f"output_{len(sentences)+1}.jpg", _slide_inputs("ellipsis", text="...", size=100)))
+    slides.append(("output_cta.jpg", _slide_inputs("cta", text=CTA_TEXT, size=FONT_SIZE + 5)))
+
+    for filename, inputs in slides:
+        output_path = os.path.join(story_dir, filename)
+        digest = slide_digest(inputs, files=[slide_file, FONT_PATH])
+        if not force and manifest.is_current(output_path, digest):
+            reused += 1
+        else:
+            _render_slide(output_path, slide_file, inputs["kind"], inputs["text"], inputs["size"])
+            manifest.record(output_path, digest)
+        output_files.append(output_path)
+
+    manifest.save()
+    if reused:
+        print(f"Reused {reused} of {len(output_files)} unchanged slides for story {story_index}")
+    return output_files
+
+def _render_title_slide(output_path, title_file, title, country, caption, color_scheme):
+    """Draw and save the title slide of a story."""
+    try:
+        title_img = get_template(title_file)
+    except IOError:
+        raise FileNotFoundError(f"Unable to open image file {title_file}")
+    try:
+        title_font = get_font(FONT_PATH, TITLE_FONT_SIZE)
+        country_font = get_font(FONT_PATH, COUNTRY_FONT_SIZE)
+        caption_font = get_font(FONT_PATH, CAPTION_FONT_SIZE)
+    except IOError:
+        raise FileNotFoundError(f"Font file {FONT_PATH} not found.")
+    
+    draw_title_slide(title_img, title, country, caption, title_font, country_font, caption_font, TEXT_COLOR, color_scheme)
+    title_img.convert("RGB").save(output_path, format="JPEG")
+
+def _render_slide(output_path, slide_file, kind, text, font_size):
+    """Draw and save a content, ellipsis or call-to-action slide."""
+    try:
+        img = get_template(slide_file)
+    except IOError:
+        raise FileNotFoundError(f"Unable to open image file {slide_file}")
+
+    if kind == "ellipsis":
+        # A large, bold ellipsis ("...") marks stories cut short after 10 sentences
         try:
-            ellipsis_img = Image.open(slide_file).convert("RGBA")
-        except IOError:
-            raise FileNotFoundError(f"Unable to open image file {slide_file}")
-        try:
-            ellipsis_font = ImageFont.truetype(FONT_PATH, 100)
+            ellipsis_font = get_font(FONT_PATH, font_size)
         except IOError:
-            ellipsis_font = content_font
+            ellipsis_font = get_font(FONT_PATH, FONT_SIZE)
 
-        draw = ImageDraw.Draw(ellipsis_img)
+        draw = ImageDraw.Draw(img)
         # Get text size for centering
-        bbox = draw.textbbox((0, 0), "...", font=ellipsis_font)
+        bbox = draw.textbbox((0, 0), text, font=ellipsis_font)
         w = bbox[2] - bbox[0]
         h = bbox[3] - bbox[1]
-        img_width, img_height = ellipsis_img.size
+        img_width, img_height = img.size
         x = (img_width - w) / 2
         y = (img_height - h) / 2
-        draw.text((x, y), "...", font=ellipsis_font, fill=TEXT_COLOR)
+        draw.text((x, y), text, font=ellipsis_font, fill=TEXT_COLOR)
+    else:
+        try:
+            font = get_font(FONT_PATH, font_size)
+        except IOError:
+            raise FileNotFoundError(f"Font file {FONT_PATH} not found.")
+        draw_wrapped_text(img, text, font, TEXT_COLOR, MARGIN_PERCENTAGE)
 
-        ellipsis_output_path = os.path.join(story_dir, f"output_{len(sentences)+1}.jpg")
-        ellipsis_img.convert("RGB").save(ellipsis_output_path, format="JPEG")
-        output_files.append(ellipsis_output_path)
-    
-    # --- STEP 3: Create CTA Slide ---
-    try:
-        cta_img = Image.open(slide_file).convert("RGBA")
-    except IOError:
-        raise FileNotFoundError(f"Unable to open image file {slide_file}")
-    try:
-        cta_font = ImageFont.truetype(FONT_PATH, FONT_SIZE + 5)
-    except IOError:
-        raise FileNotFoundError(f"Font file {FONT_PATH} not found.")
-    
-    draw_wrapped_text(cta_img, CTA_TEXT, cta_font, TEXT_COLOR, MARGIN_PERCENTAGE)
-    cta_output_path = os.path.join(story_dir, "output_cta.jpg")
-    cta_img.convert("RGB").save(cta_output_path, format="JPEG")
-    output_files.append(cta_output_path)
+    img.convert("RGB").save(output_path, format="JPEG")
+
+def post_caption_for(row):
+    """Use caption from CSV if provided; otherwise compose a default caption."""
+    country, _, _, caption = story_fields(row)
+    return caption if caption.strip() else f"Story from {country}\n\n{CTA_TEXT}"
+
+def make_session(dry_run=False):
+    """Build the shared Instagram session; dry_run swaps in a client that only logs uploads."""
+    return InstagramSession(
+        INSTAGRAM_USERNAME,
+        INSTAGRAM_PASSWORD,
+        settings_path=None if dry_run else INSTAGRAM_SETTINGS_FILE,
+        client_factory=DryRunClient if dry_run else Client,
+    )
+
+def create_and_post_story(row, story_index, output_dir=OUTPUT_DIR, session=None):
+    """
+    Create and post a single story carousel to Instagram using CSV row data.
+    The row should contain 'Country', 'Story', 'Title', and 'Caption'.
+    Pass a shared InstagramSession to avoid logging in again for every story.
+    """
+    output_files = render_story(row, story_index, output_dir)
+    if output_files is None:
+        return False
     
     # --- STEP 4: Post to Instagram ---
-    # Use caption from CSV if provided; otherwise compose a default caption.
-    post_caption = caption if caption.strip() else f"Story from {country}\n\n{CTA_TEXT}"
-    
+    if session is None:
+        session = make_session()
     try:
-        insta_client = Client()
-        insta_client.login(INSTAGRAM_USERNAME, INSTAGRAM_PASSWORD)
-        print(f"Logged in to Instagram for story {story_index}")
-        
-        if len(output_files) == 1:
-            media = insta_client.photo_upload(output_files[0], caption=post_caption)
-            print(f"Posted single image for story {story_index}: media ID {media.pk}")
-        else:
-            media = insta_client.album_upload(output_files, caption=post_caption)
-            print(f"Posted carousel for story {story_index}: media ID {media.pk}")
-        insta_client.logout()
-        print(f"Successfully posted story {story_index} from {country}")
+        media = session.upload(output_files, post_caption_for(row))
+        print(f"Posted carousel for story {story_index}: media ID {media.pk}")
         return True
     except Exception as e:
         print(f"Failed to post story {story_index}:")
         traceback.print_exc()
         return False
 
-# === MAIN PROGRAM ===
+def render_and_post(df, indices, output_dir=OUTPUT_DIR, session=None, force=False):
+    """
+    Render the selected stories and post them through a single Instagram session.
+    The calling thread renders carousels into a bounded queue while an UploadWorker
+    drains it, pacing uploads with a token bucket instead of a fixed sleep.
+    Returns the UploadWorker so callers can inspect its posted/failed lists.
+    """
+    if session is None:
+        session = make_session()
+    upload_queue = make_upload_queue()
+    worker = UploadWorker(upload_queue, session, TokenBucket(POSTS_PER_MINUTE / 60, POST_BURST))
+    worker.start()
+
+    try:
+        for i, idx in enumerate(indices):
+            row = df.iloc[idx]
+            print(f"\nRendering story {i+1} of {len(indices)} (CSV index {idx})...")
+            try:
+                output_files = render_story(row, idx, output_dir, force)
+            except Exception:
+                print(f"Failed to render story {idx}:")
+                traceback.print_exc()
+                continue
+            if output_files:
+                upload_queue.put((idx, output_files, post_caption_for(row)))
+    finally:
+        upload_queue.put(None)
+        worker.join()
+    return worker
+
+# === BATCH RENDERING ===
+
+def _render_story_job(job):
+    """Worker entry point for render_batch: render one (story_index, row, output_dir, force) job."""
+    story_index, row, output_dir, force = job
+    try:
+        return story_index, render_story(row, story_index, output_dir, force)
+    except Exception:
+        print(f"Failed to render story {story_index}:")
+        traceback.print_exc()
+        return story_index, None
 
-def main():
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+def render_batch(df, indices=None, output_dir=OUTPUT_DIR, workers=RENDER_WORKERS, chunksize=RENDER_CHUNKSIZE,
+                 force=False):
+    """
+    Render carousels for many stories across a process pool, without posting.
+    
+    Args:
+        df: DataFrame with the REQUIRED_COLUMNS
+        indices: Positional row indices to render (defaults to every row)
+        output_dir: Directory that receives the story_N/output_*.jpg folders
+        workers: Number of worker processes; 1 renders in the current process
+        chunksize: Number of stories sent to a worker at a time
+        force: Re-render every slide even if its inputs are unchanged
     
-    # Read CSV data
+    Returns a list of (story_index, output_files) pairs in the same order as indices;
+    output_files is None for stories that were skipped or failed.
+    """
+    if indices is None:
+        indices = range(len(df))
+    os.makedirs(output_dir, exist_ok=True)
+
+    # Plain dicts pickle far more cheaply than pandas Series when sent to the workers.
+    records = df[REQUIRED_COLUMNS].to_dict("records")
+    jobs = [(idx, records[idx], output_dir, force) for idx in indices]
+    print(f"Rendering {len(jobs)} stories with {workers} worker(s)...")
+
+    if workers <= 1:
+        results = [_render_story_job(job) for job in jobs]
+    else:
+        # executor.map yields results in submission order, so the output stays deterministic
+        # no matter which worker finishes first.
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(_render_story_job, jobs, chunksize=chunksize))
+
+    rendered = sum(1 for _, files in results if files)
+    print(f"\nRendered {rendered} out of {len(jobs)} stories into {output_dir}")
+    return results
+
+# === MAIN PROGRAM ===
+
+def load_stories():
+    """Load the stories CSV, returning None if it cannot be read or lacks the required columns."""
     try:
         df = pd.read_csv(CSV_FILE)
         print(f"Successfully loaded CSV with {len(df)} stories")
     except Exception as e:
         print(f"Failed to load CSV file: {e}")
-        return
+        return None
     
     # Verify required columns
-    required_columns = ['Country', 'Story', 'Title', 'Caption']
-    missing_columns = [col for col in required_columns if col not in df.columns]
+    missing_columns = [col for col in REQUIRED_COLUMNS if col not in df.columns]
     if missing_columns:
         print(f"CSV file missing required columns: {missing_columns}")
+        return None
+    return df
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Render Lumina story carousels and post them to Instagram.")
+    parser.add_argument("--render-only", action="store_true",
+                        help="Render every story in the CSV without posting anything.")
+    parser.add_argument("--workers", type=int, default=RENDER_WORKERS,
+                        help="Number of worker processes used by --render-only.")
+    parser.add_argument("--force", action="store_true",
+                        help="Re-render every slide, ignoring the per-story render manifests.")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="Render and go through the upload queue without contacting Instagram.")
+    parser.add_argument("--output-dir", default=OUTPUT_DIR,
+                        help="Directory that receives the rendered story folders.")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    os.makedirs(args.output_dir, exist_ok=True)
+    
+    df = load_stories()
+    if df is None:
+        return
+
+    if args.render_only:
+        render_batch(df, output_dir=args.output_dir, workers=args.workers, force=args.force)
         return
     
     # Select random number of stories (between MIN_STORIES and MAX_STORIES)
@@ -358,14 +530,8 @@ def main():
     selected_indices = random.sample(range(len(df)), num_stories)
     print(f"Selected {num_stories} stories to process")
     
-    successful_posts = 0
-    for i, idx in enumerate(selected_indices):
-        row = df.iloc[idx]
-        print(f"\nPosting story {i+1} of {num_stories} (CSV index {idx})...")
-        if create_and_post_story(row, idx):
-            successful_posts += 1
-            # Add a short delay between posts if not the last one
-            if i < len(selected_indices) - 1:
-                time.sleep(15)
-    
-    print(f"\nCompleted posting {successful_posts} out of {num_stories} selected stories")
\ No newline at end of file
+    worker = render_and_post(df, selected_indices, args.output_dir, make_session(args.dry_run), args.force)
+    print(f"\nCompleted posting {len(worker.posted)} out of {num_stories} selected stories")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import os
+import json
+import hashlib
+
+MANIFEST_NAME = "manifest.json"
+
+# File content hashes keyed by path, revalidated against (size, mtime).
+_FILE_DIGESTS = {}
+# Stands in for files that do not exist (e.g. an optional font the renderer falls back from)
+MISSING_DIGEST = hashlib.sha256(b"missing").hexdigest()
+
+def file_digest(path):
+    """
+    SHA-256 of a file's contents, recomputed only when its size or modification time changes.
+    A missing file hashes to MISSING_DIGEST, so its absence is still part of a slide's digest.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        _FILE_DIGESTS.pop(path, None)
+        return MISSING_DIGEST
+    stamp = (stat.st_size, stat.st_mtime_ns)
+    cached = _FILE_DIGESTS.get(path)
+    if cached and cached[0] == stamp:
+        return cached[1]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    _FILE_DIGESTS[path] = (stamp, digest)
+    return digest
+
+def slide_digest(inputs, files=()):
+    """
+    Content address of a slide: a hash of its JSON-serialisable inputs (text, sizes, colours,
+    layout settings) together with the contents of the template and font files it is drawn from.
+    """
+    payload = {
+        "inputs": inputs,
+        "files": {path: file_digest(path) for path in files},
+    }
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+class RenderManifest:
+    """
+    Per-story record of which input digest produced each rendered slide.
+    Stored as manifest.json inside the story directory, so parallel workers never share a file.
+    """
+
+    def __init__(self, story_dir):
+        self.path = os.path.join(story_dir, MANIFEST_NAME)
+        self.previous = {}
+        self.slides = {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.previous = json.load(f).get("slides", {})
+        except (OSError, ValueError):
+            self.previous = {}
+
+    def is_current(self, output_path, digest):
+        """True if output_path exists and was last rendered from the same inputs."""
+        name = os.path.basename(output_path)
+        if self.previous.get(name) == digest and os.path.exists(output_path):
+            self.slides[name] = digest
+            return True
+        return False
+
+    def record(self, output_path, digest):
+        """Note that output_path has just been rendered from inputs with this digest."""
+        self.slides[os.path.basename(output_path)] = digest
+
+    def save(self):
+        """
+        Write the manifest and delete slides left over from an earlier render that are no
+        longer part of the carousel (e.g. the story now has fewer sentences).
+        """
+        story_dir = os.path.dirname(self.path)
+        for name in set(self.previous) - set(self.slides):
+            stale = os.path.join(story_dir, name)
+            if os.path.exists(stale):
+                os.remove(stale)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"slides": self.slides}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
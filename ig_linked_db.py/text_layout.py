@@ -0,0 +1,156 @@
+from bisect import bisect_right
+from collections import OrderedDict
+
+# Word widths are evicted least recently used first; the line and layout caches are dropped
+# wholesale once this many entries accumulate.
+MAX_CACHED_WORDS = 65536
+MAX_CACHED_LAYOUTS = 4096
+MAX_CACHED_LINES = 65536
+
+# (font key, word) -> advance width, font key -> {line: bbox width}, layout key -> TextLayout.
+# Fonts are keyed by the file and size they were loaded from; fonts without a file are not cached.
+_WORD_WIDTHS = OrderedDict()
+_LINE_WIDTHS = {}
+_LAYOUTS = {}
+
+class TextLayout:
+    """
+    Result of wrapping a piece of text for one font and width.
+
+    Attributes:
+        lines: Wrapped lines of text
+        line_widths: Rendered (bounding box) width of each line in pixels
+        offsets: Vertical offset of each line from the top of the text block
+        line_height: Height of a line including line spacing
+        total_height: Height of the whole text block
+    """
+
+    def __init__(self, lines, line_widths, line_height):
+        self.lines = lines
+        self.line_widths = line_widths
+        self.line_height = line_height
+        self.offsets = [i * line_height for i in range(len(lines))]
+        self.total_height = len(lines) * line_height
+
+    def line_origins(self, box_left, box_width, box_top, box_height, align="center"):
+        """
+        Return the (x, y) drawing origin of every line, with the block centred vertically in the box.
+        align is "center" (each line centred in the box width) or "left" (lines start at box_left).
+        """
+        start_y = box_top + (box_height - self.total_height) // 2
+        origins = []
+        for width, offset in zip(self.line_widths, self.offsets):
+            if align == "left":
+                x = box_left
+            else:
+                x = box_left + (box_width - width) // 2
+            origins.append((x, start_y + offset))
+        return origins
+
+def _font_key(font):
+    """
+    Identify a font by the file, size and face it was loaded from, or None for fonts not loaded
+    from a file (an object's id could be reused by a later font, so those are never cached).
+    """
+    path = getattr(font, "path", None)
+    if isinstance(path, str):
+        return (path, getattr(font, "size", None), getattr(font, "index", 0))
+    return None
+
+def word_width(font, word):
+    """Advance width of word in font, measured once per font while it stays cached."""
+    font_key = _font_key(font)
+    if font_key is None:
+        return font.getlength(word)
+    key = (font_key, word)
+    width = _WORD_WIDTHS.get(key)
+    if width is None:
+        width = font.getlength(word)
+        _WORD_WIDTHS[key] = width
+        if len(_WORD_WIDTHS) > MAX_CACHED_WORDS:
+            _WORD_WIDTHS.popitem(last=False)
+    else:
+        _WORD_WIDTHS.move_to_end(key)
+    return width
+
+def line_width(font, line):
+    """Bounding-box width of a full line, the measure the wrapped lines must fit within."""
+    font_key = _font_key(font)
+    if font_key is None:
+        bbox = font.getbbox(line)
+        return bbox[2] - bbox[0] if bbox else 0
+    widths = _LINE_WIDTHS.setdefault(font_key, {})
+    width = widths.get(line)
+    if width is None:
+        bbox = font.getbbox(line)
+        width = bbox[2] - bbox[0] if bbox else 0
+        if len(widths) >= MAX_CACHED_LINES:
+            widths.clear()
+        widths[line] = width
+    return width
+
+def _break_lines(words, font, max_width):
+    """
+    Greedily pack words into lines no wider than max_width.
+
+    Cumulative advance widths give a binary-search estimate of where each line ends; the
+    estimate is then confirmed against the exact bounding box and nudged a word at a time,
+    so the result matches measuring every prefix while typically measuring each line once.
+    A word that is wider than max_width on its own gets a line to itself.
+    """
+    space = word_width(font, " ")
+    # Advance widths and bounding boxes differ only by side bearings at the ends of a line,
+    # so an estimate this far past max_width cannot fit and needs no exact measurement.
+    slack = getattr(font, "size", float("inf"))
+    # prefix[k] = width of words[:k], each followed by a space
+    prefix = [0]
+    for word in words:
+        prefix.append(prefix[-1] + word_width(font, word) + space)
+
+    lines = []
+    widths = []
+    start = 0
+    n = len(words)
+    while start < n:
+        # Largest end with prefix[end] - prefix[start] - space <= max_width
+        end = bisect_right(prefix, prefix[start] + space + max_width) - 1
+        end = min(max(end, start + 1), n)
+
+        line = " ".join(words[start:end])
+        width = line_width(font, line)
+        while width > max_width and end > start + 1:
+            end -= 1
+            line = " ".join(words[start:end])
+            width = line_width(font, line)
+        while end < n:
+            if prefix[end + 1] - prefix[start] - space > max_width + slack:
+                break
+            longer = " ".join(words[start:end + 1])
+            longer_width = line_width(font, longer)
+            if longer_width > max_width:
+                break
+            end, line, width = end + 1, longer, longer_width
+
+        lines.append(line)
+        widths.append(width)
+        start = end
+    return lines, widths
+
+def layout_text(text, font, max_width, line_spacing=0):
+    """
+    Wrap text to max_width pixels in font and return a TextLayout.
+    Layouts are memoized per (font, text, max_width, line_spacing), so repeated slides
+    such as the call-to-action are laid out once per process.
+    """
+    font_key = _font_key(font)
+    key = (font_key, text, max_width, line_spacing)
+    layout = _LAYOUTS.get(key)
+    if layout is None:
+        lines, widths = _break_lines(text.split(), font, max_width)
+        line_height = font.getbbox("Aj")[3] + line_spacing
+        layout = TextLayout(lines, widths, line_height)
+        if font_key is not None:
+            if len(_LAYOUTS) >= MAX_CACHED_LAYOUTS:
+                _LAYOUTS.clear()
+            _LAYOUTS[key] = layout
+    return layout
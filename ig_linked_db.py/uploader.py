@@ -0,0 +1,189 @@
+import os
+import time
+import queue
+import random
+import threading
+import traceback
+from types import SimpleNamespace
+
+# === RATE LIMITING ===
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+    Tokens refill continuously at `rate` per second up to `capacity`; acquire() blocks until one is available.
+    """
+
+    def __init__(self, rate, capacity=1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` tokens are available, then take them."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return
+                wait = (tokens - self.tokens) / self.rate
+            self.sleep(wait)
+
+# === INSTAGRAM SESSION ===
+
+class DryRunClient:
+    """
+    Stand-in for instagrapi.Client that logs uploads instead of posting them.
+    Implements only the methods InstagramSession uses.
+    """
+
+    def __init__(self):
+        self.settings = {}
+        self.uploads = []
+
+    def load_settings(self, path):
+        self.settings = {"loaded_from": path}
+
+    def dump_settings(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("{}")
+
+    def login(self, username, password):
+        print(f"[dry run] Logged in as {username}")
+        return True
+
+    def logout(self):
+        print("[dry run] Logged out")
+        return True
+
+    def photo_upload(self, path, caption=""):
+        self.uploads.append(([path], caption))
+        return SimpleNamespace(pk=f"dry-run-{len(self.uploads)}")
+
+    def album_upload(self, paths, caption=""):
+        self.uploads.append((list(paths), caption))
+        return SimpleNamespace(pk=f"dry-run-{len(self.uploads)}")
+
+class InstagramSession:
+    """
+    A single logged-in Instagram client shared by every upload.
+    Session settings are restored from settings_path before logging in and written back afterwards,
+    so later runs reuse the same device and cookies instead of performing a fresh login.
+
+    Args:
+        username, password: Instagram credentials
+        settings_path: JSON file used with load_settings/dump_settings (None disables persistence)
+        client_factory: Zero-argument callable returning an instagrapi-compatible client
+    """
+
+    def __init__(self, username, password, settings_path=None, client_factory=None):
+        if client_factory is None:
+            from instagrapi import Client
+            client_factory = Client
+        self.username = username
+        self.password = password
+        self.settings_path = settings_path
+        self.client_factory = client_factory
+        self.client = None
+
+    def login(self):
+        """Log in once, reusing persisted session settings when available."""
+        if self.client is not None:
+            return self.client
+        client = self.client_factory()
+        if self.settings_path and os.path.exists(self.settings_path):
+            try:
+                client.load_settings(self.settings_path)
+                print(f"Loaded Instagram session settings from {self.settings_path}")
+            except Exception as e:
+                print(f"Ignoring unreadable session settings {self.settings_path}: {e}")
+        client.login(self.username, self.password)
+        if self.settings_path:
+            client.dump_settings(self.settings_path)
+        print(f"Logged in to Instagram as {self.username}")
+        self.client = client
+        return client
+
+    def upload(self, output_files, caption):
+        """Upload one carousel (or a single photo) and return the media object."""
+        client = self.login()
+        if len(output_files) == 1:
+            return client.photo_upload(output_files[0], caption=caption)
+        return client.album_upload(output_files, caption=caption)
+
+    def close(self):
+        """Persist the latest session settings. The session is kept alive rather than logged out."""
+        if self.client is not None and self.settings_path:
+            self.client.dump_settings(self.settings_path)
+
+# === UPLOAD WORKER ===
+
+class UploadWorker(threading.Thread):
+    """
+    Consumer thread that posts rendered carousels from a queue through one InstagramSession.
+    Queue items are (story_index, output_files, caption) tuples; put None to stop the worker.
+    Every upload attempt first takes a token from rate_limiter. A failed upload is retried up to
+    max_retries times with exponential backoff before the story is recorded as failed.
+    """
+
+    def __init__(self, upload_queue, session, rate_limiter, max_retries=2, base_delay=30.0,
+                 max_delay=300.0, sleep=time.sleep):
+        super().__init__(name="instagram-upload", daemon=True)
+        self.upload_queue = upload_queue
+        self.session = session
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.sleep = sleep
+        self.posted = []
+        self.failed = []
+
+    def run(self):
+        try:
+            while True:
+                item = self.upload_queue.get()
+                try:
+                    if item is None:
+                        return
+                    self._post(*item)
+                finally:
+                    self.upload_queue.task_done()
+        finally:
+            self.session.close()
+
+    def _post(self, story_index, output_files, caption):
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            try:
+                media = self.session.upload(output_files, caption)
+            except Exception:
+                if attempt == self.max_retries:
+                    print(f"Failed to post story {story_index}:")
+                    traceback.print_exc()
+                    self.failed.append(story_index)
+                    return
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay *= 0.5 + random.random() / 2
+                print(f"Posting story {story_index} failed; retrying in {delay:.0f}s")
+                self.sleep(delay)
+                continue
+            print(f"Posted story {story_index} ({len(output_files)} slides): media ID {media.pk}")
+            self.posted.append(story_index)
+            return
+
+def make_upload_queue(maxsize=4):
+    """Bounded queue between the renderer and the UploadWorker, so rendering never runs far ahead."""
+    return queue.Queue(maxsize=maxsize)
@@ -6,8 +6,13 @@ import traceback
 import openai
 
 import os
+import sys
 from dotenv import load_dotenv
 
+# The shared text layout engine lives next to the production renderer.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ig_linked_db.py"))
+from text_layout import layout_text
+
 load_dotenv()  # Load variables from .env
 
 API_KEY = os.getenv('API_KEY')
@@ -61,43 +66,11 @@ def draw_wrapped_text(img, text, font, text_color, margin_percentage=10):
     max_text_width = img_width - (2 * margin)
     
     # Split text into lines that fit within the width
-    lines = []
-    words = text.split()
-    current_line = []
-    
-    for word in words:
-        # Add the word to the current line and check width
-        test_line = ' '.join(current_line + [word])
-        # getbbox() gets the bounding box (left, top, right, bottom)
-        bbox = font.getbbox(test_line)
-        line_width = bbox[2] - bbox[0] if bbox else 0
-        
-        if line_width <= max_text_width:
-            current_line.append(word)
-        else:
-            # Line is full, append it and start a new line
-            if current_line:  # Don't append empty lines
-                lines.append(' '.join(current_line))
-            current_line = [word]
-    
-    # Append the last line if it's not empty
-    if current_line:
-        lines.append(' '.join(current_line))
-    
-    # Calculate total text height
-    line_height = font.getbbox("Aj")[3] + LINE_SPACING  # Height of text line plus spacing
-    total_text_height = len(lines) * line_height
+    layout = layout_text(text, font, max_text_width, LINE_SPACING)
     
-    # Calculate starting Y position to center the text block vertically
-    start_y = (img_height - total_text_height) // 2
-    
-    # Draw each line centered horizontally
-    for i, line in enumerate(lines):
-        bbox = font.getbbox(line)
-        line_width = bbox[2] - bbox[0]
-        x = (img_width - line_width) // 2
-        y = start_y + (i * line_height)
-        draw.text((x, y), line, font=font, fill=text_color)
+    # Center the text block vertically and draw each line centered horizontally
+    for line, origin in zip(layout.lines, layout.line_origins(0, img_width, 0, img_height)):
+        draw.text(origin, line, font=font, fill=text_color)
 
 def draw_left_aligned_text(img, title_text, country_text, title_font, country_font, arrow_font, text_color, left_margin):
     """Draw left-aligned text for the title slide with an arrow pointing right."""
@@ -108,27 +81,11 @@ def draw_left_aligned_text(img, title_text, country_text, title_font, country_fo
     max_text_width = img_width - (left_margin * 2)
     
     # Wrap title text
-    title_lines = []
-    words = title_text.split()
-    current_line = []
-    
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        bbox = title_font.getbbox(test_line)
-        line_width = bbox[2] - bbox[0] if bbox else 0
-        
-        if line_width <= max_text_width:
-            current_line.append(word)
-        else:
-            if current_line:
-                title_lines.append(' '.join(current_line))
-            current_line = [word]
-    
-    if current_line:
-        title_lines.append(' '.join(current_line))
+    title_layout = layout_text(title_text, title_font, max_text_width, LINE_SPACING)
+    title_lines = title_layout.lines
     
     # Calculate spacing
-    title_line_height = title_font.getbbox("Aj")[3] + LINE_SPACING
+    title_line_height = title_layout.line_height
     country_height = country_font.getbbox("Aj")[3]
     
     # Position text vertically (centered with some spacing)
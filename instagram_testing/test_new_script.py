@@ -1,9 +1,14 @@
 import os
+import sys
 from PIL import Image, ImageDraw, ImageFont
 import nltk
 from nltk.tokenize import sent_tokenize
 import traceback
 
+# The shared text layout engine lives next to the production renderer.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "ig_linked_db.py"))
+from text_layout import layout_text
+
 # Download the Punkt tokenizer if needed.
 nltk.download('punkt')
 
@@ -77,50 +82,18 @@ def draw_wrapped_text(img, text, font, text_color, margin_percentage=30,
         left_margin = margin
     
     # Split text into lines that fit within the width
-    lines = []
-    words = text.split()
-    current_line = []
-    
-    for word in words:
-        test_line = ' '.join(current_line + [word])
-        bbox = font.getbbox(test_line)
-        line_width = bbox[2] - bbox[0] if bbox else 0
-        
-        if line_width <= max_text_width:
-            current_line.append(word)
-        else:
-            if current_line:
-                lines.append(' '.join(current_line))
-            current_line = [word]
-    
-    if current_line:
-        lines.append(' '.join(current_line))
-    
-    line_height = font.getbbox("Aj")[3] + LINE_SPACING
-    total_text_height = len(lines) * line_height
+    layout = layout_text(text, font, max_text_width, LINE_SPACING)
     
     if custom_margins:
-        available_height = img_height - (custom_margins['top'] + custom_margins['bottom'])
-        start_y = custom_margins['top'] + (available_height - total_text_height) // 2
+        box_left = custom_margins['left']
+        box_width = img_width - (custom_margins['left'] + custom_margins['right'])
+        box_top = custom_margins['top']
+        box_height = img_height - (custom_margins['top'] + custom_margins['bottom'])
     else:
-        start_y = (img_height - total_text_height) // 2
+        box_left, box_width, box_top, box_height = 0, img_width, 0, img_height
     
-    for i, line in enumerate(lines):
-        bbox = font.getbbox(line)
-        line_width = bbox[2] - bbox[0]
-        if custom_margins:
-            if align == "center":
-                available_width = img_width - (custom_margins['left'] + custom_margins['right'])
-                x = custom_margins['left'] + (available_width - line_width) // 2
-            elif align == "left":
-                x = custom_margins['left']
-        else:
-            if align == "center":
-                x = (img_width - line_width) // 2
-            elif align == "left":
-                x = 0
-        y = start_y + (i * line_height)
-        draw.text((x, y), line, font=font, fill=text_color)
+    for line, origin in zip(layout.lines, layout.line_origins(box_left, box_width, box_top, box_height, align)):
+        draw.text(origin, line, font=font, fill=text_color)
 
 def draw_title_slide(img, title_text, country_text, caption_text, title_font, country_font, caption_font, text_color):
     """Draw text on the title slide according to the template."""
@@ -1,9 +1,11 @@
-import pandas as pd
+import argparse
+import io
 import re
 
-def extract_stories():
-    # The stories from the conversation
-    stories_text = """
+from storage import write_records
+
+# The stories from the conversation
+STORIES_TEXT = """
 1. "I had a high school math teacher who refused to answer questions from the young women in his class because, 'You won't need to know math after you graduate.' He made it clear that it was because he figured we'd all be married and pregnant."
 
 2. "When I was in undergraduate school, I had a meeting with my major advisor at the beginning of my senior year to discuss my grad school applications. He told me that as much as he enjoyed having me in his classes, his specialty was one that he couldn't advise. The reason he gave: It was too dangerous for a woman to travel to the archaeological sites I was studying in his classes."
@@ -49,34 +51,71 @@ def extract_stories():
 22. "My first year teaching, I was the only female teacher at a new charter school. We were having some sort of gathering, and there was cake that no one had started eating yet. I didn't think much of it until one of the many male teachers handed me a serving knife to cut and serve the cake. They had been waiting the whole time for me to serve the cake because, apparently, that's something only women can do. I promptly put the knife down and excused myself to the restroom. Spoiler: I left after my contract for that year ended."
 
 23. "I have a PhD in chemistry. Just over a year ago, I got hired at a huge pharmaceutical company, and my husband and I were preparing for a major move for the job. An assessor from the moving service my company provided came to determine the amount of insurance we needed for the move. Even though her paperwork was in my (rather feminine) name and she had been in contact with me, she called my husband 'doctor' and asked him if he was excited about his new job. I was in shock, but my husband just pointed at me and said, 'You'll have to ask her, she's the doctor.'"
+"""
+
+OUTPUT_PATH = "buzzfeed_stories.csv"
+OUTPUT_COLUMNS = ["story_number", "story_text"]
+OUTPUT_TYPES = {"story_number": "int64", "story_text": "string"}
+
+# A story starts on a line like '12. "...' ; every other non-blank line continues the current one
+STORY_START = re.compile(r'\s*(\d+)\.\s+(\S.*)')
+OPENING_QUOTES = '"\u201c'
+CLOSING_QUOTES = '"\u201d'
+
+def _story_record(number, paragraphs):
+    """Join a story's paragraphs and strip the quotation marks around it."""
+    first, last = paragraphs[0], paragraphs[-1]
+    if first[0] in OPENING_QUOTES and last[-1] in CLOSING_QUOTES:
+        # Multi-paragraph quotes reopen the quote on every paragraph without closing the previous one
+        paragraphs = [p[1:] if p[0] in OPENING_QUOTES else p for p in paragraphs]
+        paragraphs[-1] = paragraphs[-1][:-1]
+    return {'story_number': int(number), 'story_text': '\n\n'.join(paragraphs)}
+
+def iter_stories(lines):
+    """
+    Yield {'story_number', 'story_text'} for every numbered story in an iterable of lines.
+
+    Lines are consumed one at a time, so a file of any size can be streamed. Text before the
+    first numbered line is ignored, and blank lines separate the paragraphs of a story.
     """
-    
-    # Initialize list to store stories
-    stories = []
-    
-    # Split the text into individual stories and process them
-    for story in stories_text.strip().split('\n\n'):
-        # Skip empty lines
-        if not story.strip():
-            continue
-            
-        # Extract story number and text
-        match = re.match(r'(\d+)\.\s*"(.+)"', story.strip())
+    number, paragraphs, current = None, [], []
+    for line in lines:
+        line = line.strip()
+        match = STORY_START.fullmatch(line)
+        if match or not line:
+            if current:
+                paragraphs.append(' '.join(current))
+                current = []
         if match:
-            story_num = int(match.group(1))
-            story_text = match.group(2)
-            
-            stories.append({
-                'story_number': story_num,
-                'story_text': story_text
-            })
-    
-    # Create DataFrame
-    df = pd.DataFrame(stories)
-    
-    # Save to CSV
-    df.to_csv('buzzfeed_stories.csv', index=False)
-    print(f"Successfully extracted {len(stories)} stories and saved to buzzfeed_stories.csv")
+            if number is not None and paragraphs:
+                yield _story_record(number, paragraphs)
+            number, paragraphs, current = match.group(1), [], [match.group(2)]
+        elif line and number is not None:
+            current.append(line)
+    if current:
+        paragraphs.append(' '.join(current))
+    if number is not None and paragraphs:
+        yield _story_record(number, paragraphs)
+
+def extract_stories(source=None, output_path=OUTPUT_PATH):
+    """
+    Extract the numbered stories from source (a text file path; the stories above by default)
+    and write them to output_path (.csv or .parquet) as they are parsed.
+    """
+    if source is None:
+        count = write_records(iter_stories(io.StringIO(STORIES_TEXT)), output_path, OUTPUT_COLUMNS, OUTPUT_TYPES)
+    else:
+        with open(source, 'r', encoding='utf-8') as f:
+            count = write_records(iter_stories(f), output_path, OUTPUT_COLUMNS, OUTPUT_TYPES)
+    print(f"Successfully extracted {count} stories and saved to {output_path}")
+    return count
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Extract numbered quote stories from a listicle text dump")
+    parser.add_argument("source", nargs="?", help="Text file to read (default: the built-in BuzzFeed stories)")
+    parser.add_argument("-o", "--output", default=OUTPUT_PATH, help="Output .csv or .parquet file")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    extract_stories()
+    args = parse_args()
+    extract_stories(args.source, args.output)
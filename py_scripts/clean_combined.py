@@ -1,18 +1,54 @@
-import pandas as pd
+import argparse
+import ntpath
 
-def first_non_null(series):
-    non_null = series.dropna()
-    if not non_null.empty:
-        return non_null.iloc[0]
-    return None
+from storage import load_dataset
 
-# Read the combined CSV file
-df = pd.read_csv("polysim\\combined_data.csv")
+# Source files whose values win where several have one, most trusted first, by file name
+# (e.g. "processed_Mean age at first marriage.csv"); unlisted files keep their combined order
+SOURCE_PRECEDENCE = []
 
-# Group by the 'Economy' column and aggregate all other columns by taking the first non-null value
-grouped_df = df.groupby("Economy", as_index=False).agg(first_non_null)
+def source_name(path):
+    """File name of a source_file value; ntpath splits both the Windows-style and / paths it holds."""
+    return ntpath.basename(path) if isinstance(path, str) else path
 
-# Save the formatted DataFrame to a new CSV file
-grouped_df.to_csv("polysim\\combined_data_formatted.csv", index=False)
+def coalesce(df, key="Economy", precedence=None, source_col="source_file"):
+    """
+    Merge all rows sharing a key into one, taking the first non-null value of every column.
 
-print("Formatted combined CSV saved as polysim/combined_data_formatted.csv")
\ No newline at end of file
+    Runs as a single native GroupBy.first(), which already skips missing values. Without
+    precedence rows are taken in their existing order, so the earliest source file wins.
+    precedence is a list of source file names (or paths; only the file name is compared), most
+    trusted first (e.g. the most recent indicator extract); rows are stably reordered by it so
+    that source's value wins wherever it has one. Sources not listed rank after all listed ones.
+    """
+    if precedence:
+        rank = {source_name(source): i for i, source in enumerate(precedence)}
+        order = df[source_col].astype(object).map(source_name).map(rank).fillna(len(rank))
+        df = df.iloc[order.to_numpy().argsort(kind="stable")]
+    return df.groupby(key, as_index=False, sort=True).first()
+
+def format_combined(df, precedence=None):
+    """
+    Group by the 'Economy' column and aggregate all other columns by taking the first non-null value,
+    preferring sources by precedence (SOURCE_PRECEDENCE by default).
+    """
+    if precedence is None:
+        precedence = SOURCE_PRECEDENCE
+    return coalesce(df, key="Economy", precedence=precedence)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Merge the combined indicator rows into one per economy")
+    parser.add_argument("--prefer", action="append", metavar="FILE",
+                        help="Source file whose values win, most trusted first (repeatable); "
+                             "defaults to SOURCE_PRECEDENCE")
+    args = parser.parse_args()
+
+    # Read the combined CSV file
+    df = load_dataset("polysim\\combined_data.csv", schema="indicators")
+
+    grouped_df = format_combined(df, precedence=args.prefer)
+
+    # Save the formatted DataFrame to a new CSV file
+    grouped_df.to_csv("polysim\\combined_data_formatted.csv", index=False)
+
+    print("Formatted combined CSV saved as polysim/combined_data_formatted.csv")
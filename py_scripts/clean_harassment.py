@@ -1,13 +1,16 @@
-import pandas as pd
+from storage import load_dataset
 
-# Read CSV file (adjust the full path if necessary)
-df = pd.read_csv("polysim\Women making their own informed decisions regarding sexual relations, contraceptive use and reproductive health care  (% of women age 15-49).csv")
+def clean_harassment(df):
+    """Drop rows that do not have a value in the fourth column (zero-indexed column 3)."""
+    return df.dropna(subset=[df.columns[3]])
 
-# Drop rows that do not have a value in the fourth column (zero-indexed column 3)
-df = df.dropna(subset=[df.columns[3]])
+if __name__ == "__main__":
+    # Read CSV file (adjust the full path if necessary)
+    df = load_dataset("polysim\Women making their own informed decisions regarding sexual relations, contraceptive use and reproductive health care  (% of women age 15-49).csv", schema="indicators")
 
-# Save the cleaned DataFrame to a new CSV file
-df.to_csv("polysim\processed_Women making their own informed decisions regarding sexual relations, contraceptive use and reproductive health care  (% of women age 15-49).csv", index=False)
+    df = clean_harassment(df)
 
-print("Cleaned CSV saved as polysim/cleaned_sexual_violence.csv")
+    # Save the cleaned DataFrame to a new CSV file
+    df.to_csv("polysim\processed_Women making their own informed decisions regarding sexual relations, contraceptive use and reproductive health care  (% of women age 15-49).csv", index=False)
 
+    print("Cleaned CSV saved as polysim/cleaned_sexual_violence.csv")
@@ -1,16 +1,21 @@
-import pandas as pd
+from storage import load_dataset
 
-# Read the CSV file (adjust the path as needed)
-df = pd.read_csv("polysim\Mean age at first marriage.csv")
+def clean_married(df):
+    """
+    Drop rows that do not have a value in the fourth column, then drop columns 2, 3 and 5.
+    Assuming the CSV has a header row, column 4 corresponds to df.columns[3]
+    (one-based numbering; the dropped columns are df.columns[1], df.columns[2], df.columns[4]).
+    """
+    df = df.dropna(subset=[df.columns[3]])
+    return df.drop(columns=[df.columns[1], df.columns[2], df.columns[4]])
 
-# Drop rows that do not have a value in the fourth column.
-# Assuming the CSV has a header row, column 4 corresponds to df.columns[3]
-df = df.dropna(subset=[df.columns[3]])
+if __name__ == "__main__":
+    # Read the CSV file (adjust the path as needed)
+    df = load_dataset("polysim\Mean age at first marriage.csv", schema="indicators")
 
-# Drop columns 2, 3, and 5 (assuming one-based numbering; these correspond to df.columns[1], df.columns[2], df.columns[4])
-df = df.drop(columns=[df.columns[1], df.columns[2], df.columns[4]])
+    df = clean_married(df)
 
-# Save the processed DataFrame to a new CSV file.
-df.to_csv("polysim/processed_Mean age at first marriage.csv", index=False)
+    # Save the processed DataFrame to a new CSV file.
+    df.to_csv("polysim/processed_Mean age at first marriage.csv", index=False)
 
-print("Data processing complete. Processed file saved as polysim/processed_Mean age at first marriage.csv")
\ No newline at end of file
+    print("Data processing complete. Processed file saved as polysim/processed_Mean age at first marriage.csv")
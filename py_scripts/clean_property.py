@@ -1,12 +1,16 @@
-import pandas as pd
+from storage import load_dataset
 
-# Read CSV file (adjust the full path if necessary)
-df = pd.read_csv("polysim\Women and men have equal ownership rights to immovable property (1=yes; 0=no).csv")
+def clean_property(df):
+    """Keep rows where the value in column 5 (zero-indexed column 4) is 2023; drop others."""
+    return df[df[df.columns[4]] == 2023]
 
-# Keep rows where the value in column 5 (zero-indexed column 4) is 2023; drop others
-df = df[df[df.columns[4]] == 2023]
+if __name__ == "__main__":
+    # Read CSV file (adjust the full path if necessary)
+    df = load_dataset("polysim\Women and men have equal ownership rights to immovable property (1=yes; 0=no).csv", schema="indicators")
 
-# Save the cleaned DataFrame to a new CSV file
-df.to_csv("polysim\processed_Women and men have equal ownership rights to immovable property (1=yes; 0=no).csv", index=False)
+    df = clean_property(df)
 
-print("Cleaned CSV saved as polysim/processed_There is legislation on sexual harassment in employment (1=yes; 0=no).csv")
\ No newline at end of file
+    # Save the cleaned DataFrame to a new CSV file
+    df.to_csv("polysim\processed_Women and men have equal ownership rights to immovable property (1=yes; 0=no).csv", index=False)
+
+    print("Cleaned CSV saved as polysim/processed_There is legislation on sexual harassment in employment (1=yes; 0=no).csv")
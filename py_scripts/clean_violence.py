@@ -1,15 +1,17 @@
-import pandas as pd
+from storage import load_dataset
 
-# Read CSV file (adjust the full path if necessary)
-df = pd.read_csv("polysim/sexual violence in the last 12 months (% of ever-partnered women ages 15-49).csv")
+def clean_violence(df):
+    """Drop rows without a value in the fourth column, then drop the fifth column entirely."""
+    df = df.dropna(subset=[df.columns[3]])
+    return df.drop(columns=[df.columns[4]])
 
-# Drop rows that do not have a value in the fourth column (zero-indexed column 3)
-df = df.dropna(subset=[df.columns[3]])
+if __name__ == "__main__":
+    # Read CSV file (adjust the full path if necessary)
+    df = load_dataset("polysim/sexual violence in the last 12 months (% of ever-partnered women ages 15-49).csv", schema="indicators")
 
-# Drop the fifth column entirely (zero-indexed column 4)
-df = df.drop(columns=[df.columns[4]])
+    df = clean_violence(df)
 
-# Save the cleaned DataFrame to a new CSV file
-df.to_csv("polysim/processed_sexual violence in the last 12 months(% of ever-partnered women 15-49).csv", index=False)
+    # Save the cleaned DataFrame to a new CSV file
+    df.to_csv("polysim/processed_sexual violence in the last 12 months(% of ever-partnered women 15-49).csv", index=False)
 
-print("Cleaned CSV saved as polysim/cleaned_sexual_violence.csv")
\ No newline at end of file
+    print("Cleaned CSV saved as polysim/cleaned_sexual_violence.csv")
@@ -1,8 +1,14 @@
 import pandas as pd
 import re
 
-# Read the CSV file
-df = pd.read_csv('finaldb.csv')
+from near_dedup import drop_near_duplicates
+from storage import load_dataset, save_dataset
+
+# Stories at least this similar (estimated Jaccard over shingles) count as the same story
+DEDUP_THRESHOLD = 0.8
+
+# Read the dataset (from its Parquet copy when there is a current one)
+df = load_dataset('finaldb.csv')
 
 # Remove outer quotes from Title column
 df['Title'] = df['Title'].apply(lambda x: x[1:-1] if isinstance(x, str) and x.startswith('"') and x.endswith('"') else x)
@@ -32,14 +38,15 @@ def replace_ending_punctuation(title):
 # # Apply the function to the Title column
 # df['Title'] = df['Title'].apply(replace_ending_punctuation)
 
-# Remove duplicates based on Story content
-df_no_duplicates = df.drop_duplicates(subset=['Story'])
+# Remove duplicate and near-duplicate stories (whitespace, quote or truncation differences),
+# keeping the longest copy of each and recording its cluster in cluster_id
+df_no_duplicates = drop_near_duplicates(df, column='Story', threshold=DEDUP_THRESHOLD)
 
 # Count removed duplicates
 removed_count = original_count - len(df_no_duplicates)
 print(f"Removed {removed_count} duplicate stories")
 
-# Save to new file
-df_no_duplicates.to_csv('stories_final.csv', index=False)
+# Save to new file (Parquet for later stages, plus the CSV export)
+save_dataset(df_no_duplicates, 'stories_final.csv')
 
-print(f"Successfully processed {len(df_no_duplicates)} stories and saved to 'stories_final.csv'")
\ No newline at end of file
+print(f"Successfully processed {len(df_no_duplicates)} stories and saved to 'stories_final.parquet' and 'stories_final.csv'")
\ No newline at end of file
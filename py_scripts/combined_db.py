@@ -1,5 +1,7 @@
 import pandas as pd
 
+from storage import load_dataset
+
 # List of file paths
 file_paths = [
     "polysim\\processed_Mean age at first marriage.csv",
@@ -9,19 +11,25 @@ file_paths = [
     "polysim\\processed_Women making their own informed decisions regarding sexual relations, contraceptive use and reproductive health care  (% of women age 15-49).csv"
 ]
 
-dfs = []
-for path in file_paths:
+def combine_frames(*dfs, paths=file_paths):
+    """
+    Stack the processed indicator frames, preserving all columns present in any of them.
+    Each row records the file it came from in a source_file column.
+    """
+    tagged = []
+    for df, path in zip(dfs, paths):
+        # Optionally, add a column to indicate the source file
+        tagged.append(df.assign(source_file=path))
+    return pd.concat(tagged, ignore_index=True, sort=False)
+
+if __name__ == "__main__":
     # Read each CSV file
-    df = pd.read_csv(path)
-    
-    # Optionally, add a column to indicate the source file
-    df['source_file'] = path
-    dfs.append(df)
+    dfs = [load_dataset(path, schema="indicators") for path in file_paths]
 
-# Combine all dataframes, preserving all columns present in any file
-combined_df = pd.concat(dfs, ignore_index=True, sort=False)
+    # Combine all dataframes, preserving all columns present in any file
+    combined_df = combine_frames(*dfs)
 
-# Save the combined DataFrame to a new CSV file
-combined_df.to_csv("polysim\\combined_data.csv", index=False)
+    # Save the combined DataFrame to a new CSV file
+    combined_df.to_csv("polysim\\combined_data.csv", index=False)
 
-print("Combined CSV saved as polysim/combined_data.csv")
\ No newline at end of file
+    print("Combined CSV saved as polysim/combined_data.csv")
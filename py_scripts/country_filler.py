@@ -1,9 +1,11 @@
-import pandas as pd
 import re
 import pycountry
 import openai
 import os
 
+from llm_client import get_client
+from storage import load_dataset
+
 # -----CONFIGURATION -----
 CSV_FILENAME = 'masterdb - Copy.csv'
 OUTPUT_FILENAME = 'masterdb_updated.csv'
@@ -33,23 +35,83 @@ synonyms = {
     # Add more synonyms as needed
 }
 
+# ----- COUNTRY MATCHER -----
+def _trie_regex(names):
+    """
+    Build a regex alternation over names that shares common prefixes (a character trie).
+    Optional tails are greedy, so at any position the longest matching name is tried first.
+    """
+    trie = {}
+    for name in names:
+        node = trie
+        for ch in name:
+            node = node.setdefault(ch, {})
+        node[''] = True
+
+    def emit(node):
+        branches = [re.escape(ch) + emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return '(?:' + body + ')?' if '' in node else body
+
+    return emit(trie)
+
+class CountryMatcher:
+    """
+    Finds the country a narrative mentions with one compiled regex pass per text.
+
+    Candidate names are ranked in priority order: every synonym (in dict order) before every
+    official name (in list order). The result is the highest-priority name that occurs as a whole
+    word anywhere in the text, i.e. exactly what testing each name in turn would return.
+    """
+
+    def __init__(self, synonyms, countries):
+        # Lower-cased name -> (priority rank, canonical country); earlier entries win duplicates
+        self.ranks = {}
+        for rank, (name, country) in enumerate(list(synonyms.items()) + [(c.lower(), c) for c in countries]):
+            self.ranks.setdefault(name, (rank, country))
+
+        # The regex reports only the longest name at each position. Any shorter name that also
+        # matches there is a prefix of it ending on a word boundary, so fold those in up front.
+        self.best = {}
+        for name in self.ranks:
+            candidates = [self.ranks[name]]
+            for i in range(1, len(name)):
+                prefix = name[:i]
+                if prefix in self.ranks and _is_word(name[i - 1]) != _is_word(name[i]):
+                    candidates.append(self.ranks[prefix])
+            self.best[name] = min(candidates)
+
+        # A zero-width lookahead lets matches overlap, so a name nested in a longer one is still seen.
+        self.pattern = re.compile(r'\b(?=(' + _trie_regex(self.ranks) + r')\b)')
+
+    def _pick(self, names):
+        if not names:
+            return None
+        return min(self.best[name] for name in names)[1]
+
+    def find(self, text):
+        """Return the country mentioned in text, or None."""
+        return self._pick(self.pattern.findall(text.lower()))
+
+    def match_series(self, texts):
+        """Vectorised find() over a pandas Series of texts; returns a Series of countries (NaN if unmatched)."""
+        matches = texts.fillna('').astype(str).str.lower().str.findall(self.pattern)
+        return matches.map(self._pick)
+
+def _is_word(ch):
+    return re.match(r'\w', ch) is not None
+
+country_matcher = CountryMatcher(synonyms, countries)
+
 # ----- HELPER FUNCTIONS -----
 def find_country_in_text(text):
     """
-    Try to detect a country name from the narrative text using simple substring search.
-    Returns the detected country or None.
+    Try to detect a country name from the narrative text using whole-word matching.
+    Synonyms take priority over official names. Returns the detected country or None.
     """
-    text_lower = text.lower()
-    # Check for synonyms first
-    for key, country in synonyms.items():
-        if re.search(r'\b' + re.escape(key) + r'\b', text_lower):
-            return country
-
-    # Check for full country names
-    for country in countries:
-        if re.search(r'\b' + re.escape(country.lower()) + r'\b', text_lower):
-            return country
-    return None
+    return country_matcher.find(text)
 
 def find_country_with_ai(text):
     """
@@ -63,8 +125,8 @@ def find_country_with_ai(text):
         f"Narrative: {text}\n\nCountry:"
     )
     try:
-        response = openai.Completion.create(
-            model="text-davinci-003",
+        country = get_client().complete(
+            "text-davinci-003",
             prompt=prompt,
             max_tokens=10,
             temperature=0.0,
@@ -72,7 +134,6 @@ def find_country_with_ai(text):
             n=1,
             stop=["\n"]
         )
-        country = response.choices[0].text.strip()
         # Normalize common responses
         if country.lower() == 'unknown' or not country:
             return None
@@ -99,7 +160,7 @@ def update_country_in_csv(input_file, output_file):
     # Read the CSV file.
     # If the CSV file does not have headers, you might need to set header=None and use column indices.
     try:
-        df = pd.read_csv(input_file, encoding='utf-8', encoding_errors='ignore')
+        df = load_dataset(input_file, schema='stories', encoding='utf-8', encoding_errors='ignore')
     except Exception as e:
         print(f"Error reading the CSV file: {e}")
         return
@@ -109,18 +170,29 @@ def update_country_in_csv(input_file, output_file):
     # Adjust these if your CSV file uses different headers.
     country_col = df.columns[0]
     narrative_col = df.columns[1]
+    # Countries are filled in below, so the column cannot stay a fixed set of categories
+    df[country_col] = df[country_col].astype(object)
+
+    # Rows where the country is missing or empty (you can adjust condition as needed)
+    missing = df[country_col].isnull() | (df[country_col].astype(str).str.strip() == "")
 
-    # Process each row where the country is missing or blank.
-    for index, row in df.iterrows():
-        # Check if country is missing or empty (you can adjust condition as needed)
-        if pd.isnull(row[country_col]) or str(row[country_col]).strip() == "":
-            narrative_text = str(row[narrative_col])
-            detected_country = determine_country(narrative_text)
+    # Match country names across all missing rows in one vectorised pass
+    narratives = df.loc[missing, narrative_col].astype(str)
+    detected = country_matcher.match_series(narratives)
+    found = detected.notna()
+    df.loc[found[found].index, country_col] = detected[found]
+    print(f"Matched a country name in {int(found.sum())} of {int(missing.sum())} rows missing a country")
+
+    # Fall back to the AI model only for the rows the name matcher could not resolve
+    if USE_AI_FALLBACK and openai.api_key:
+        for index, narrative_text in narratives[~found].items():
+            detected_country = find_country_with_ai(narrative_text)
             if detected_country:
                 df.at[index, country_col] = detected_country
                 print(f"Row {index}: Set country to {detected_country}")
             else:
                 print(f"Row {index}: Could not determine country.")
+        print(get_client().stats.summary())
 
     # Write the updated DataFrame back to a CSV file.
     try:
@@ -0,0 +1,137 @@
+import asyncio
+import csv
+import os
+import random
+
+# ----- RUNNER -----
+class EnrichmentRunner:
+    """
+    Sends chat requests through an LLMClient with bounded concurrency, retrying failures
+    with exponential backoff. Caching and deduplication of repeated requests are left to
+    the client (see llm_client.py).
+
+    Args:
+        client: LLMClient whose acomplete() is used for every request
+        concurrency: Maximum number of requests in flight
+        max_retries: Attempts after the first before giving up on a request
+        base_delay, max_delay: Backoff bounds in seconds
+    """
+
+    def __init__(self, client, concurrency=8, max_retries=5, base_delay=1.0, max_delay=30.0):
+        self.client = client
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._semaphore = None
+
+    async def complete(self, model, system_prompt, text, params):
+        """Return the model's response to text under system_prompt, raising after the final retry."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        messages = [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": text},
+        ]
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    return await self.client.acomplete(model, messages=messages, **params)
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        raise
+                    delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                    delay *= 0.5 + random.random() / 2  # jitter so retries do not arrive in lockstep
+                    print(f"Request failed ({e}); retrying in {delay:.1f}s")
+                    await asyncio.sleep(delay)
+
+# ----- CSV ENRICHMENT -----
+def read_checkpoint(output_csv, fieldnames):
+    """
+    Rows that an earlier, interrupted run wrote to output_csv, plus the byte length of the file up
+    to the end of the last complete row. A row cut off mid-write is not included, so it can be
+    truncated away before appending. Returns ([], 0) if there is no output with this header.
+    """
+    if not os.path.exists(output_csv):
+        return [], 0
+    rows, offset, consumed = [], 0, 0
+    with open(output_csv, mode="r", encoding="utf-8", errors="replace", newline="") as f:
+        last_line = ""
+
+        def lines():
+            nonlocal consumed, last_line
+            for line in f:
+                consumed += len(line.encode("utf-8"))
+                last_line = line
+                yield line
+
+        reader = csv.reader(lines())
+        try:
+            if next(reader, None) != fieldnames:
+                return [], 0
+            offset = consumed
+            for values in reader:
+                if len(values) != len(fieldnames) or not last_line.endswith(("\n", "\r")):
+                    break
+                rows.append(dict(zip(fieldnames, values)))
+                offset = consumed
+        except csv.Error:
+            pass
+    return rows, offset
+
+async def enrich_csv(input_csv, output_csv, output_column, enrich_row, checkpoint_every=20):
+    """
+    Add output_column to every row of input_csv, writing rows to output_csv in input order.
+
+    enrich_row is a coroutine function row -> value. Rows are processed concurrently but written
+    strictly in order and flushed every checkpoint_every rows, so if the run stops, the next run
+    resumes after the last complete row that reached the file. Rows already in output_csv are only
+    reused if their input columns equal the leading rows of input_csv; if the input was changed or
+    reordered, output_csv is started afresh.
+    """
+    with open(input_csv, mode="r", encoding="utf-8", newline="") as infile:
+        reader = csv.DictReader(infile)
+        fieldnames = reader.fieldnames.copy()
+        rows = list(reader)
+    key_columns = [col for col in fieldnames if col != output_column]
+    if output_column not in fieldnames:
+        fieldnames.append(output_column)
+
+    done_rows, offset = read_checkpoint(output_csv, fieldnames)
+    matches = len(done_rows) <= len(rows) and all(
+        [old.get(col, "") for col in key_columns] == [new.get(col, "") or "" for col in key_columns]
+        for old, new in zip(done_rows, rows)
+    )
+    if done_rows and not matches:
+        print(f"{output_csv} does not match {input_csv}; starting a fresh output")
+        done_rows = []
+    done = len(done_rows)
+    if done:
+        print(f"Resuming after {done} rows already in {output_csv}")
+        # Drop a row left half-written by the interrupted run
+        with open(output_csv, mode="r+b") as f:
+            f.truncate(offset)
+    pending = rows[done:]
+
+    async def process(row):
+        row[output_column] = await enrich_row(row)
+        return row
+
+    with open(output_csv, mode="a" if done else "w", newline="", encoding="utf-8") as outfile:
+        writer = csv.DictWriter(outfile, fieldnames=fieldnames)
+        if not done:
+            writer.writeheader()
+
+        tasks = [asyncio.ensure_future(process(row)) for row in pending]
+        try:
+            # Awaiting the tasks in submission order keeps the output aligned with the input.
+            for count, task in enumerate(tasks, start=done + 1):
+                row = await task
+                writer.writerow(row)
+                print(f"Processed row {count}: {output_column} -> {row[output_column]}")
+                if count % checkpoint_every == 0:
+                    outfile.flush()
+        finally:
+            for task in tasks:
+                task.cancel()
+    return len(rows)
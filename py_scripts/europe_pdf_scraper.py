@@ -1,9 +1,14 @@
-from pypdf import PdfReader
+from bisect import bisect_right
+import csv
 import re
-import pandas as pd
+
+from narrative_parser import iter_narratives
+from pdf_extraction import iter_page_texts
 
 # Path to your PDF file
 pdf_path = "europe.pdf"
+output_csv = "narratives_extracted1.csv"
+output_columns = ["country", "page", "name", "age", "title", "narrative", "quotes", "keywords"]
 
 # Hard-coded table of contents mapping: (start_page, country)
 # (Page numbers are as in the PDF, starting at 1)
@@ -39,21 +44,7 @@ toc_mapping = [
     (466, "United Kingdom")
 ]
 toc_mapping.sort(key=lambda x: x[0])
-
-# Extract text from each page using pypdf
-reader = PdfReader(pdf_path)
-pages_text = []  # list index 0 corresponds to page 1
-for page in reader.pages:
-    text = page.extract_text() or ""
-    pages_text.append(text)
-
-all_text = "\n".join(pages_text).replace("\r\n", "\n")
-
-# Regex pattern to extract narrative blocks.
-narrative_pattern = re.compile(
-    r'(?P<id>[A-Z]{2}\d{2})\s+Title:\s*(?P<title>.*?)\s+Narrative:\s*(?P<narrative>.*?)\s+Specifically telling quotes:\s*(?P<quotes>.*?)\s+Keywords:\s*(?P<keywords>.*?)(?=\n[A-Z]{2}\d{2}\s+Title:|\Z)',
-    re.DOTALL
-)
+toc_start_pages = [start_page for start_page, _ in toc_mapping]
 
 def extract_name(narrative, title):
     """
@@ -81,51 +72,43 @@ def extract_age(narrative):
         return age_match.group(1)
     return ""
 
-results = []
+def country_for_page(page_number):
+    """
+    The narrative belongs to the country whose starting page is the highest that is <= page_number.
+    Returns an empty string for pages before the first country section.
+    """
+    i = bisect_right(toc_start_pages, page_number) - 1
+    return toc_mapping[i][1] if i >= 0 else ""
+
+def main():
+    # Pages are extracted in parallel (and cached on disk) and parsed as they arrive,
+    # so each narrative is written as soon as its text is complete.
+    pages = (text for _, text in iter_page_texts(pdf_path))
+    with open(output_csv, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=output_columns, lineterminator="\n")
+        writer.writeheader()
+
+        # For each narrative, assign a country using the TOC mapping and extract fields.
+        for record in iter_narratives(pages):
+            narrative = record["narrative"]
+            title = record["title"]
 
-# For each narrative block, assign a country using the TOC mapping and extract fields.
-for match in narrative_pattern.finditer(all_text):
-    narrative_id = match.group("id").strip()
-    title = match.group("title").strip()
-    narrative = match.group("narrative").strip()
-    quotes = match.group("quotes").strip()
-    keywords = match.group("keywords").strip()
-    
-    # Determine the starting page for this narrative by checking each page for the narrative ID.
-    narrative_page = None
-    for i, page_text in enumerate(pages_text):
-        if narrative_id in page_text:
-            narrative_page = i + 1  # page numbers start at 1
-            break
-    if narrative_page is None:
-        narrative_page = 0  # fallback
-    
-    # Use the TOC mapping to assign a country:
-    # The narrative belongs to the country whose starting page is the highest that is <= narrative_page.
-    assigned_country = ""
-    for start_page, country in toc_mapping:
-        if narrative_page >= start_page:
-            assigned_country = country
-        else:
-            break
+            # Extract the storyteller's name and age.
+            name = extract_name(narrative, title)
+            age = extract_age(narrative)
 
-    # Extract the storyteller's name and age.
-    name = extract_name(narrative, title)
-    age = extract_age(narrative)
-    
-    results.append({
-        "country": assigned_country,
-        "page": narrative_page,
-        "name": name,
-        "age": age,
-        "title": title,
-        "narrative": narrative,
-        "quotes": quotes,
-        "keywords": keywords
-    })
+            writer.writerow({
+                "country": country_for_page(record["page"]),
+                "page": record["page"],
+                "name": name,
+                "age": age,
+                "title": title,
+                "narrative": narrative,
+                "quotes": record["quotes"],
+                "keywords": record["keywords"]
+            })
 
-# Export the results to CSV.
-df = pd.DataFrame(results, columns=["country", "page", "name", "age", "title", "narrative", "quotes", "keywords"])
-df.to_csv("narratives_extracted1.csv", index=False)
+    print("Extraction complete. Data saved to narratives_extracted.csv")
 
-print("Extraction complete. Data saved to narratives_extracted.csv")
+if __name__ == "__main__":
+    main()
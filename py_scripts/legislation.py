@@ -1,29 +1,66 @@
 import pandas as pd
 
-# Load the datasets
-df1 = pd.read_csv('polysim\combined_data_formatted.csv')
-df2 = pd.read_csv('polysim\list of laws - Data Table-export.csv')
+from storage import load_dataset
 
-# Identify the relevant columns in the laws dataset
-description_col = df2.columns[4]  # 5th column: description
-title_col = df2.columns[6]        # 7th column: title
-country_col_laws = 'Country'      # Country column in the laws file
+def _as_text(column):
+    """Column values formatted the way an f-string would, missing values included ("nan")."""
+    return column.astype(str).fillna('nan')
 
-# Build a mapping from country to concatenated law entries
-law_mapping = (
-    df2.groupby(country_col_laws)
-       .apply(lambda grp: ''.join(f"{row[title_col]}: {row[description_col]}\n\n"
-                                  for _, row in grp.iterrows()))
-       .to_dict()
-)
+def aggregate_laws(df2, title_col, description_col, country_col='Country'):
+    """
+    Aggregate the law table per country with column-wise string operations.
 
-# Create a new column 'legislation' in the first dataset
-df1['legislation'] = df1['Economy'].map(law_mapping).fillna('')
+    Returns (law_text, law_lists), both indexed by country:
+        law_text: every law of the country as "title: description" followed by a blank line,
+            concatenated in table order
+        law_lists: the same laws as a list of {"title": ..., "description": ...} dicts, with
+            missing values as None, for consumers that need the individual entries
+    """
+    laws = df2[df2[country_col].notna()]
+    entries = _as_text(laws[title_col]) + ': ' + _as_text(laws[description_col]) + '\n\n'
+    law_text = entries.groupby(laws[country_col], sort=True).agg(''.join)
 
-# Save the updated DataFrame to a new CSV
-output_path = 'polysim\combined_data_with_laws.csv'
-df1.to_csv(output_path, index=False)
+    records = pd.Series(
+        laws[[title_col, description_col]]
+            .astype(object)
+            .where(laws[[title_col, description_col]].notna(), None)
+            .rename(columns={title_col: 'title', description_col: 'description'})
+            .to_dict('records'),
+        index=laws.index,
+        dtype=object,
+    )
+    law_lists = records.groupby(laws[country_col], sort=True).agg(list)
+    return law_text, law_lists
 
+def add_legislation(df1, df2):
+    """
+    Add a 'legislation' column to df1 with every law in df2 for the country in 'Economy',
+    each written as "title: description" followed by a blank line.
+    """
+    # Identify the relevant columns in the laws dataset
+    description_col = df2.columns[4]  # 5th column: description
+    title_col = df2.columns[6]        # 7th column: title
+    country_col_laws = 'Country'      # Country column in the laws file
 
-# Provide download link
-print(f"[Download the updated CSV file here]({output_path})")
+    # Build a mapping from country to concatenated law entries
+    law_text, _ = aggregate_laws(df2, title_col, description_col, country_col_laws)
+
+    # Create a new column 'legislation' in the first dataset
+    df1 = df1.copy()
+    df1['legislation'] = df1['Economy'].map(law_text).fillna('')
+    return df1
+
+if __name__ == "__main__":
+    # Load the datasets
+    df1 = load_dataset('polysim\combined_data_formatted.csv', schema='indicators')
+    df2 = load_dataset('polysim\list of laws - Data Table-export.csv', schema='laws')
+
+    df1 = add_legislation(df1, df2)
+
+    # Save the updated DataFrame to a new CSV
+    output_path = 'polysim\combined_data_with_laws.csv'
+    df1.to_csv(output_path, index=False)
+
+
+    # Provide download link
+    print(f"[Download the updated CSV file here]({output_path})")
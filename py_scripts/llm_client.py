@@ -0,0 +1,235 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+# ----- CONFIGURATION -----
+# One cache shared by captions.py, titles.py and country_filler.py
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "llm_cache.sqlite3")
+
+# ----- CACHE -----
+class SQLiteResponseCache:
+    """
+    SQLite table of model responses keyed by a hash of the full request.
+    Safe to share between threads; every write is committed immediately so an interrupted
+    run keeps everything it already paid for.
+    """
+
+    def __init__(self, path=LLM_CACHE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " tokens INTEGER NOT NULL DEFAULT 0,"
+            " created REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, key):
+        """Return (response, tokens) for key, or None if it has not been cached."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT response, tokens FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+    def put(self, key, model, response, tokens):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response, tokens, created) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, tokens, time.time()),
+            )
+            self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+# ----- STATISTICS -----
+class LLMStats:
+    """Counters for one client: cache hits, real requests, coalesced duplicates and tokens saved."""
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.tokens_used = 0
+        self.tokens_saved = 0
+        self.lock = threading.Lock()
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+
+    def summary(self):
+        return (f"LLM requests: {self.misses} sent, {self.hits} cache hits, "
+                f"{self.coalesced} coalesced duplicates; "
+                f"{self.tokens_used} tokens used, {self.tokens_saved} tokens saved")
+
+# ----- TRANSPORTS -----
+# A transport takes (model, request, params), where request is {"messages": [...]} for chat models or
+# {"prompt": "..."} for completion models, and returns (text, total_tokens).
+def openai_sync_transport(model, request, params):
+    """Blocking transport using the module-level openai client (configured via openai.api_key)."""
+    import openai
+    if "messages" in request:
+        response = openai.chat.completions.create(model=model, messages=request["messages"], **params)
+        text = response.choices[0].message.content.strip()
+    else:
+        response = openai.completions.create(model=model, prompt=request["prompt"], **params)
+        text = response.choices[0].text.strip()
+    usage = getattr(response, "usage", None)
+    return text, getattr(usage, "total_tokens", 0) or 0
+
+def openai_async_transport(client=None):
+    """
+    Build an async transport backed by the OpenAI SDK.
+    Pass an openai.AsyncOpenAI(base_url=...) client to point it at a local stub server.
+    """
+    async def transport(model, request, params):
+        nonlocal client
+        if client is None:
+            import openai
+            client = openai.AsyncOpenAI(api_key=openai.api_key)
+        if "messages" in request:
+            response = await client.chat.completions.create(model=model, messages=request["messages"], **params)
+            text = response.choices[0].message.content.strip()
+        else:
+            response = await client.completions.create(model=model, prompt=request["prompt"], **params)
+            text = response.choices[0].text.strip()
+        usage = getattr(response, "usage", None)
+        return text, getattr(usage, "total_tokens", 0) or 0
+    return transport
+
+# ----- CLIENT -----
+class LLMClient:
+    """
+    Cached, deduplicating front end for model requests.
+
+    Identical requests (same model, messages or prompt, and parameters) are answered from the
+    SQLite cache; identical requests that are already in flight wait for the first one instead
+    of being sent again. Both the blocking complete() and the async acomplete() share the cache.
+
+    Args:
+        cache: SQLiteResponseCache, or None to disable caching
+        transport: Blocking transport used by complete()
+        async_transport: Coroutine transport used by acomplete()
+    """
+
+    def __init__(self, cache=None, transport=openai_sync_transport, async_transport=None):
+        self.cache = cache
+        self.transport = transport
+        self.async_transport = async_transport
+        self.stats = LLMStats()
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self._async_inflight = {}
+
+    @staticmethod
+    def request_key(model, request, params):
+        payload = json.dumps({"model": model, "request": request, "params": params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _request(messages, prompt):
+        if (messages is None) == (prompt is None):
+            raise ValueError("Pass exactly one of messages or prompt")
+        return {"messages": messages} if messages is not None else {"prompt": prompt}
+
+    def _cached(self, key):
+        if self.cache is None:
+            return None
+        hit = self.cache.get(key)
+        if hit is not None:
+            self.stats.add(hits=1, tokens_saved=hit[1])
+            return hit[0]
+        return None
+
+    def _store(self, key, model, text, tokens):
+        self.stats.add(misses=1, tokens_used=tokens)
+        if self.cache is not None:
+            self.cache.put(key, model, text, tokens)
+
+    def complete(self, model, messages=None, prompt=None, **params):
+        """Blocking request; returns the response text."""
+        request = self._request(messages, prompt)
+        key = self.request_key(model, request, params)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            text, tokens = future.result()
+            self.stats.add(coalesced=1, tokens_saved=tokens)
+            return text
+
+        try:
+            # Another thread may have stored the response between our cache miss and taking the lead
+            hit = self.cache.get(key) if self.cache is not None else None
+            if hit is not None:
+                self.stats.add(hits=1, tokens_saved=hit[1])
+                text, tokens = hit
+            else:
+                text, tokens = self.transport(model, request, params)
+                self._store(key, model, text, tokens)
+            future.set_result((text, tokens))
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    async def acomplete(self, model, messages=None, prompt=None, **params):
+        """Async request; returns the response text."""
+        if self.async_transport is None:
+            self.async_transport = openai_async_transport()
+        request = self._request(messages, prompt)
+        key = self.request_key(model, request, params)
+        cached = self._cached(key)
+        if cached is not None:
+            return cached
+
+        future = self._async_inflight.get(key)
+        if future is not None:
+            text, tokens = await asyncio.shield(future)
+            self.stats.add(coalesced=1, tokens_saved=tokens)
+            return text
+
+        future = self._async_inflight[key] = asyncio.get_running_loop().create_future()
+        try:
+            text, tokens = await self.async_transport(model, request, params)
+            self._store(key, model, text, tokens)
+            future.set_result((text, tokens))
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting on it
+            future.exception()
+            raise
+        finally:
+            del self._async_inflight[key]
+
+_default_client = None
+
+def get_client():
+    """Process-wide LLMClient backed by the shared cache at LLM_CACHE_PATH."""
+    global _default_client
+    if _default_client is None:
+        _default_client = LLMClient(SQLiteResponseCache(LLM_CACHE_PATH))
+    return _default_client
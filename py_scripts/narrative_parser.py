@@ -0,0 +1,77 @@
+import re
+from bisect import bisect_right
+
+# A record starts on a new line with its ID followed by "Title:", e.g. "AT01 Title: ..."
+record_boundary = re.compile(r'\n(?=[A-Z]{2}\d{2}\s+Title:)')
+
+# Fields of one record; the text handed to it already ends where the next record begins.
+# Quotes and keywords are optional so a record missing either is still read on its own
+# instead of running on into the following record.
+record_pattern = re.compile(
+    r'(?P<id>[A-Z]{2}\d{2})\s+Title:\s*(?P<title>.*?)\s+Narrative:\s*(?P<narrative>.*?)'
+    r'(?:\s+Specifically telling quotes:\s*(?P<quotes>.*?))?(?:\s+Keywords:\s*(?P<keywords>.*?))?\s*\Z',
+    re.DOTALL
+)
+
+narrative_id_pattern = re.compile(r'[A-Z]{2}\d{2}')
+
+# Characters before the end of the buffered text that are rescanned when the next page arrives,
+# so a record boundary split across a page break is still found
+BOUNDARY_OVERLAP = 256
+
+def parse_record(text):
+    """
+    Parse the fields of a single record.
+    Returns (fields, start) where start is the offset of the record ID in text,
+    or (None, None) if text does not contain a complete record.
+    """
+    match = record_pattern.search(text)
+    if match is None:
+        return None, None
+    fields = {name: (match.group(name) or "").strip() for name in ("id", "title", "narrative", "quotes", "keywords")}
+    return fields, match.start()
+
+def iter_narratives(pages):
+    """
+    Yield narrative records as dicts (id, title, narrative, quotes, keywords, page) from an
+    iterable of page texts in page order.
+
+    Only the record currently being read is kept in memory: text is split on record boundaries
+    as pages arrive and each finished record is parsed on its own, with partial records carried
+    over page breaks. A record's page is the first page its ID appears on, or failing that the
+    page its text starts on.
+    """
+    first_pages = {}    # narrative ID -> first page it appears on
+    page_offsets = []   # document offset at which each page starts (pages joined by "\n")
+    length = 0          # characters of the document read so far
+    buffer = ""         # text of the record currently being read
+    buffer_offset = 0   # document offset of buffer[0]
+    scan_from = 0
+
+    def emit(text, offset):
+        fields, start = parse_record(text)
+        if fields is not None:
+            fields["page"] = first_pages.get(fields["id"]) or bisect_right(page_offsets, offset + start)
+            yield fields
+
+    for page_number, page_text in enumerate(pages, start=1):
+        page_text = page_text.replace("\r\n", "\n")
+        for narrative_id in narrative_id_pattern.findall(page_text):
+            first_pages.setdefault(narrative_id, page_number)
+
+        if page_number > 1:
+            buffer += "\n"
+            length += 1
+        page_offsets.append(length)
+        buffer += page_text
+        length += len(page_text)
+
+        start = 0
+        for boundary in record_boundary.finditer(buffer, scan_from):
+            yield from emit(buffer[start:boundary.start()], buffer_offset + start)
+            start = boundary.start() + 1
+        buffer = buffer[start:]
+        buffer_offset += start
+        scan_from = max(0, len(buffer) - BOUNDARY_OVERLAP)
+
+    yield from emit(buffer, buffer_offset)
@@ -0,0 +1,206 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+
+# Stories whose estimated Jaccard similarity (over shingles) reaches this are duplicates
+DEFAULT_THRESHOLD = 0.8
+# MinHash values per story
+SIGNATURE_SIZE = 128
+# Each shingle is the normalised UTF-8 bytes starting at a word, e.g. "the body bags wo"
+SHINGLE_BYTES = 16
+# Stories shingled together; bounds the memory used for bytes and shingles
+TEXTS_PER_BLOCK = 4096
+# A pair at exactly the threshold must become an LSH candidate with at least this probability
+CANDIDATE_RECALL = 0.95
+# Members of an LSH bucket are compared with up to this many neighbours on either side, i.e. with
+# every other member in buckets of at most BUCKET_WINDOW + 1 texts
+BUCKET_WINDOW = 64
+
+_SPACE = ord(' ')
+_SEPARATOR = 0
+_FULL = np.uint64(0xFFFFFFFFFFFFFFFF)
+_EMPTY = np.iinfo(np.uint32).max
+_ROTATION_OFFSET = np.uint32(0x9E3779B1)
+
+# Byte normalisation: ASCII letters are lowercased, ASCII digits kept, every other ASCII byte
+# (punctuation, quotes, whitespace, NUL) becomes a space; UTF-8 multi-byte sequences pass through.
+_BYTE_MAP = np.arange(256, dtype=np.uint8)
+_BYTE_MAP[:128] = _SPACE
+for _c in b'abcdefghijklmnopqrstuvwxyz0123456789':
+    _BYTE_MAP[_c] = _c
+for _c in b'ABCDEFGHIJKLMNOPQRSTUVWXYZ':
+    _BYTE_MAP[_c] = _c + 32
+
+def _mix(x):
+    """splitmix64 finaliser: spreads 64-bit values over all bits."""
+    with np.errstate(over='ignore'):
+        x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return x ^ (x >> np.uint64(31))
+
+def normalized_bytes(texts):
+    """
+    Concatenated UTF-8 bytes of texts with case, punctuation and whitespace differences removed:
+    ASCII is lowercased, ASCII punctuation, typographic quotes and dashes (U+2000-U+203F) and
+    no-break spaces become spaces, and runs of spaces collapse to one with none at either end.
+    Every text is followed by a NUL byte (which never occurs in the normalised text itself).
+    """
+    encoded = [t.encode('utf-8') for t in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    buf = _BYTE_MAP[np.frombuffer(b'\0'.join(encoded) + b'\0', dtype=np.uint8)]
+    buf[np.cumsum(lengths + 1) - 1] = _SEPARATOR
+
+    # General punctuation (E2 80 80-BF) and U+00A0 (C2 A0) are blanked byte for byte
+    lead = np.flatnonzero(buf[:-2] == 0xE2)
+    lead = lead[(buf[lead + 1] == 0x80) & (buf[lead + 2] >= 0x80) & (buf[lead + 2] <= 0xBF)]
+    for offset in range(3):
+        buf[lead + offset] = _SPACE
+    nbsp = np.flatnonzero(buf[:-1] == 0xC2)
+    nbsp = nbsp[buf[nbsp + 1] == 0xA0]
+    buf[nbsp] = _SPACE
+    buf[nbsp + 1] = _SPACE
+
+    # Drop spaces at the start of a text or after another space, then the trailing one
+    space = buf == _SPACE
+    drop = space.copy()
+    drop[1:] &= space[:-1] | (buf[:-1] == _SEPARATOR)
+    buf = buf[~drop]
+    trailing = buf[:-1] == _SPACE
+    trailing &= buf[1:] == _SEPARATOR
+    return buf[np.append(~trailing, True)]
+
+def shingle_hashes(texts, shingle_bytes=SHINGLE_BYTES):
+    """
+    64-bit hash of the shingle starting at every word of every normalised text.
+    Returns (hashes, doc) where doc[i] is the index of the text hashes[i] came from, ascending.
+    A shingle stops at the end of its text, so shingles never span two texts.
+    """
+    buf = normalized_bytes(texts)
+    separators = np.flatnonzero(buf == _SEPARATOR)
+
+    word = (buf != _SPACE) & (buf != _SEPARATOR)
+    word_start = word.copy()
+    word_start[1:] &= ~word[:-1]
+    starts = np.flatnonzero(word_start)
+    doc = np.searchsorted(separators, starts)
+    remaining = separators[doc] - starts
+
+    # 64-bit little-endian words at every byte offset, read straight from the buffer
+    padded = np.concatenate([buf, np.zeros(shingle_bytes, dtype=np.uint8)])
+    at = np.ndarray(shape=(len(buf) + shingle_bytes - 7,), dtype='<u8', buffer=padded, strides=(1,))
+    hashes = np.zeros(len(starts), dtype=np.uint64)
+    for offset in range(0, shingle_bytes, 8):
+        # Bytes past the end of the text are masked out
+        kept = np.clip(remaining - offset, 0, 8).astype(np.uint64) * np.uint64(8)
+        mask = np.where(kept == 64, _FULL, (np.uint64(1) << (kept % np.uint64(64))) - np.uint64(1))
+        hashes = _mix(hashes ^ (at[starts + offset] & mask))
+    return hashes, doc
+
+def minhash_signatures(hashes, doc, n_docs, size=SIGNATURE_SIZE):
+    """
+    One-permutation MinHash: each shingle hash picks one of size bins and competes for that bin's
+    minimum, so every shingle is hashed once instead of once per signature position. Empty bins
+    borrow from the next filled bin (rotation densification), which keeps equal-position
+    agreement an estimate of Jaccard similarity for short texts too.
+    Returns an (n_docs, size) uint32 array; texts without shingles are left at the maximum.
+    """
+    signatures = np.full(n_docs * size, _EMPTY, dtype=np.uint32)
+    bins = ((hashes >> np.uint64(32)) % np.uint64(size)).astype(np.int64)
+    np.minimum.at(signatures, doc * size + bins, (hashes & np.uint64(_EMPTY)).astype(np.uint32))
+    signatures = signatures.reshape(n_docs, size)
+
+    empty = signatures == _EMPTY
+    rows = np.flatnonzero(empty.any(axis=1) & ~empty.all(axis=1))
+    if len(rows):
+        columns = np.arange(size)
+        filled = np.where(empty[rows], 4 * size, columns)
+        # Index of the next filled bin at or after each bin, wrapping around the row
+        doubled = np.concatenate([filled, filled + size], axis=1)
+        following = np.minimum.accumulate(doubled[:, ::-1], axis=1)[:, ::-1][:, :size]
+        distance = (following - columns).astype(np.uint32)
+        with np.errstate(over='ignore'):
+            borrowed = signatures[rows[:, None], following % size] + distance * _ROTATION_OFFSET
+        signatures[rows] = np.where(empty[rows], borrowed, signatures[rows])
+    return signatures
+
+def lsh_bands(size, threshold):
+    """
+    Rows per band and number of bands for LSH banding: the most rows per band (fewest false
+    candidates) for which a pair at the threshold is still a candidate with CANDIDATE_RECALL.
+    """
+    best = (1, size)
+    for rows in range(1, size + 1):
+        bands = size // rows
+        if 1 - (1 - threshold ** rows) ** bands >= CANDIDATE_RECALL:
+            best = (rows, bands)
+    return best
+
+def candidate_pairs(signatures, rows, bands, window=BUCKET_WINDOW):
+    """
+    Pairs of texts whose signatures agree on every row of at least one band.
+    Texts are sorted by band key and each is paired with the following members of its bucket,
+    up to window of them, so small buckets yield all their pairs (a duplicate pair is not lost
+    because a dissimilar text sorts between them) and large ones stay bounded.
+    """
+    n_docs = len(signatures)
+    multipliers = np.random.default_rng(0).integers(1, 2 ** 63, size=rows, dtype=np.uint64) | np.uint64(1)
+    pairs = [np.empty((0, 2), dtype=np.int64)]
+    with np.errstate(over='ignore'):
+        for band in range(bands):
+            block = signatures[:, band * rows:(band + 1) * rows].astype(np.uint64)
+            keys = _mix(block * multipliers).sum(axis=1, dtype=np.uint64)
+            order = np.argsort(keys, kind='stable')
+            sorted_keys = keys[order]
+            for offset in range(1, min(window, n_docs - 1) + 1):
+                # Keys are sorted, so equal keys offset apart span one bucket
+                same = sorted_keys[offset:] == sorted_keys[:-offset]
+                if not same.any():
+                    break
+                pairs.append(np.stack([order[:-offset][same], order[offset:][same]], axis=1))
+    pairs = np.concatenate(pairs)
+    pairs.sort(axis=1)
+    codes = np.unique(pairs[:, 0] * n_docs + pairs[:, 1])
+    return np.stack([codes // n_docs, codes % n_docs], axis=1)
+
+def near_duplicate_clusters(stories, threshold=DEFAULT_THRESHOLD, size=SIGNATURE_SIZE,
+                            shingle_bytes=SHINGLE_BYTES):
+    """
+    Cluster id for every story, numbered in order of first appearance.
+
+    Identical stories always share a cluster. Distinct texts are compared through MinHash
+    signatures of their shingles: LSH banding proposes candidate pairs, pairs whose estimated
+    Jaccard similarity reaches threshold are linked, and clusters are the connected components
+    of those links. No all-pairs comparison is made.
+    """
+    codes, unique_texts = pd.factorize(pd.Series(stories).fillna('').astype(str))
+    n_docs = len(unique_texts)
+    if n_docs == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    signatures = np.empty((n_docs, size), dtype=np.uint32)
+    for lo in range(0, n_docs, TEXTS_PER_BLOCK):
+        block = unique_texts[lo:lo + TEXTS_PER_BLOCK]
+        hashes, doc = shingle_hashes(block, shingle_bytes)
+        signatures[lo:lo + len(block)] = minhash_signatures(hashes, doc, len(block), size)
+
+    rows, bands = lsh_bands(size, threshold)
+    pairs = candidate_pairs(signatures, rows, bands)
+    similarity = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(axis=1)
+    pairs = pairs[similarity >= threshold]
+
+    graph = coo_matrix((np.ones(len(pairs)), (pairs[:, 0], pairs[:, 1])), shape=(n_docs, n_docs))
+    _, labels = connected_components(graph, directed=False)
+    clusters, _ = pd.factorize(labels[codes])
+    return clusters
+
+def drop_near_duplicates(df, column='Story', threshold=DEFAULT_THRESHOLD, cluster_col='cluster_id', **kwargs):
+    """
+    Keep one row per near-duplicate cluster of df[column], adding the cluster id as cluster_col.
+    The kept row is the one with the longest text (so truncated copies lose to the full story),
+    ties going to the earliest row; kept rows stay in their original order.
+    """
+    clusters = near_duplicate_clusters(df[column], threshold=threshold, **kwargs)
+    lengths = pd.Series(df[column].fillna('').astype(str).str.len().to_numpy())
+    keep = np.sort(lengths.groupby(clusters).idxmax().to_numpy())
+    return df.assign(**{cluster_col: clusters}).iloc[keep]
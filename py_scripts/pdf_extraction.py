@@ -0,0 +1,115 @@
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from pypdf import PdfReader
+
+# Per-page text is cached here, one directory per PDF content hash
+PDF_TEXT_CACHE_DIR = ".pdf_text_cache"
+# Pages handed to a worker at a time; each worker opens the PDF once per range
+PAGES_PER_TASK = 16
+
+def pdf_digest(pdf_path):
+    """SHA-256 of the PDF's bytes, so an edited or replaced file never reuses stale text."""
+    h = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class PageTextCache:
+    """
+    Extracted text of each page stored as <cache_dir>/<pdf sha256>/<page>.txt.
+    Writes go through a temporary file and os.replace, so an interrupted run never leaves a
+    truncated page behind.
+    """
+
+    def __init__(self, digest, cache_dir=PDF_TEXT_CACHE_DIR):
+        self.dir = os.path.join(cache_dir, digest)
+        os.makedirs(self.dir, exist_ok=True)
+
+    def _path(self, page_number):
+        return os.path.join(self.dir, f"{page_number:05d}.txt")
+
+    def get(self, page_number):
+        """Cached text for page_number (numbered from 1), or None if it has not been extracted."""
+        try:
+            with open(self._path(page_number), "r", encoding="utf-8", newline="") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, page_number, text):
+        path = self._path(page_number)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+
+def _extract_pages(job):
+    """Worker: extract the text of the given page numbers (from 1) of one PDF."""
+    pdf_path, page_numbers = job
+    reader = PdfReader(pdf_path)
+    return [(n, reader.pages[n - 1].extract_text() or "") for n in page_numbers]
+
+def _page_ranges(page_numbers, size):
+    """Split page numbers into consecutive runs of at most size pages."""
+    run = []
+    for n in page_numbers:
+        if run and (n != run[-1] + 1 or len(run) == size):
+            yield run
+            run = []
+        run.append(n)
+    if run:
+        yield run
+
+def iter_page_texts(pdf_path, workers=None, cache_dir=PDF_TEXT_CACHE_DIR, pages_per_task=PAGES_PER_TASK):
+    """
+    Yield (page_number, text) for every page of pdf_path in page order, numbered from 1.
+
+    Pages already in the on-disk cache are read back; the rest are extracted in page ranges
+    spread over a process pool and cached as they arrive. Pages are yielded as soon as they and
+    every page before them are available, so callers can start parsing early pages while later
+    ones are still being extracted. workers=1 extracts in this process.
+    """
+    cache = PageTextCache(pdf_digest(pdf_path), cache_dir)
+    page_count = len(PdfReader(pdf_path).pages)
+
+    cached = {}
+    missing = []
+    for n in range(1, page_count + 1):
+        text = cache.get(n)
+        if text is None:
+            missing.append(n)
+        else:
+            cached[n] = text
+
+    jobs = [(pdf_path, run) for run in _page_ranges(missing, pages_per_task)]
+    if not jobs:
+        for n in range(1, page_count + 1):
+            yield n, cached[n]
+        return
+
+    executor = None
+    if workers == 1 or len(jobs) == 1:
+        results = map(_extract_pages, jobs)
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        results = executor.map(_extract_pages, jobs)
+
+    try:
+        # executor.map returns ranges in submission order, which is page order
+        extracted = iter(results)
+        for n in range(1, page_count + 1):
+            if n not in cached:
+                for page_number, text in next(extracted):
+                    cache.put(page_number, text)
+                    cached[page_number] = text
+            yield n, cached.pop(n)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+def extract_page_texts(pdf_path, workers=None, cache_dir=PDF_TEXT_CACHE_DIR):
+    """List of every page's text; index 0 corresponds to page 1."""
+    return [text for _, text in iter_page_texts(pdf_path, workers=workers, cache_dir=cache_dir)]
@@ -0,0 +1,292 @@
+import argparse
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from storage import load_dataset
+
+# ----- CONFIGURATION -----
+POLYSIM_DIR = "polysim"
+# Fingerprints of the last successful run of each step
+STATE_PATH = os.path.join(POLYSIM_DIR, ".pipeline_state.json")
+WORKERS = 4
+
+def polysim_path(name):
+    return os.path.join(POLYSIM_DIR, name)
+
+# ----- STEPS -----
+class Step:
+    """
+    One stage of the pipeline: module.function(*input frames) -> output frame.
+
+    inputs are CSV paths, either source files or the outputs of other steps; the function gets
+    one DataFrame per input in the same order. The output is kept in memory for downstream
+    steps and also written to output, so later runs can skip the step and other scripts can
+    read it. The function is imported only when the step actually runs.
+    """
+
+    def __init__(self, name, module, function, inputs, output):
+        self.name = name
+        self.module = module
+        self.function = function
+        self.inputs = list(inputs)
+        self.output = output
+
+    def load(self):
+        return getattr(importlib.import_module(self.module), self.function)
+
+    def source_paths(self):
+        """
+        Paths of the module defining the step and of every local module it imports, directly or
+        through other local modules (e.g. storage.py, translation.py), so editing any of them
+        reruns the step. Installed packages are not followed.
+        """
+        return local_sources(self.module)
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+# Modules the runner itself passes every step's inputs through (see Pipeline.frame)
+RUNNER_MODULES = ["storage"]
+
+def _module_origin(name):
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        return None
+    if spec is None or not spec.origin or not spec.origin.endswith(".py"):
+        return None
+    return spec.origin
+
+def local_sources(module):
+    """Sorted source paths of module and the modules in SCRIPTS_DIR it transitively imports."""
+    seen = {}
+    stack = [module]
+    while stack:
+        name = stack.pop()
+        if name in seen:
+            continue
+        origin = _module_origin(name)
+        if origin is None or os.path.dirname(os.path.abspath(origin)) != SCRIPTS_DIR:
+            seen[name] = None
+            continue
+        seen[name] = origin
+        with open(origin, "r", encoding="utf-8") as f:
+            tree = ast.parse(f.read(), filename=origin)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                stack.extend(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                stack.append(node.module.split(".")[0])
+    return sorted(path for path in seen.values() if path is not None)
+
+HARASSMENT = "Women making their own informed decisions regarding sexual relations, contraceptive use and reproductive health care  (% of women age 15-49).csv"
+MARRIAGE = "Mean age at first marriage.csv"
+PROPERTY = "Women and men have equal ownership rights to immovable property (1=yes; 0=no).csv"
+VIOLENCE_IN = "sexual violence in the last 12 months (% of ever-partnered women ages 15-49).csv"
+VIOLENCE_OUT = "sexual violence in the last 12 months(% of ever-partnered women 15-49).csv"
+LEGISLATION_INDICATOR = "There is legislation on sexual harassment in employment (1=yes; 0=no).csv"
+
+COMBINED_INPUTS = [
+    polysim_path("processed_" + MARRIAGE),
+    polysim_path("processed_" + VIOLENCE_OUT),
+    # No script produces this one; it is maintained by hand and read as a source
+    polysim_path("processed_" + LEGISLATION_INDICATOR),
+    polysim_path("processed_" + PROPERTY),
+    polysim_path("processed_" + HARASSMENT),
+]
+
+# The scripts' manual run order, declared as a graph
+STEPS = [
+    Step("clean_harassment", "clean_harassment", "clean_harassment",
+         [polysim_path(HARASSMENT)], polysim_path("processed_" + HARASSMENT)),
+    Step("clean_married", "clean_married", "clean_married",
+         [polysim_path(MARRIAGE)], polysim_path("processed_" + MARRIAGE)),
+    Step("clean_property", "clean_property", "clean_property",
+         [polysim_path(PROPERTY)], polysim_path("processed_" + PROPERTY)),
+    Step("clean_violence", "clean_violence", "clean_violence",
+         [polysim_path(VIOLENCE_IN)], polysim_path("processed_" + VIOLENCE_OUT)),
+    Step("combined_db", "combined_db", "combine_frames",
+         COMBINED_INPUTS, polysim_path("combined_data.csv")),
+    Step("clean_combined", "clean_combined", "format_combined",
+         [polysim_path("combined_data.csv")], polysim_path("combined_data_formatted.csv")),
+    Step("concat", "concat", "merge_naps",
+         [polysim_path("combined_data_formatted.csv"), polysim_path("cleaned_scraped_naps.xlsx - Sheet1.csv")],
+         polysim_path("final_combined_data.csv")),
+    Step("legislation", "legislation", "add_legislation",
+         [polysim_path("combined_data_formatted.csv"), polysim_path("list of laws - Data Table-export.csv")],
+         polysim_path("combined_data_with_laws.csv")),
+    Step("translate", "translate", "translate_frame",
+         [polysim_path("combined_data_with_laws.csv")], polysim_path("combined_data_with_laws_translated.csv")),
+]
+
+# ----- RUNNER -----
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+class Pipeline:
+    """
+    Runs Steps in dependency order, skipping those whose inputs and code are unchanged.
+
+    A step's fingerprint hashes the source of its module, of the local modules it imports and of
+    RUNNER_MODULES, and the content hash of each input (for inputs produced by another step, the
+    hash of what that step wrote). A step whose fingerprint matches the last successful run, and whose output file is still the one it wrote, is skipped.
+    Independent steps run in parallel on a thread pool; frames produced in this run are handed
+    to downstream steps directly, and a skipped step's output is read from disk only if needed.
+
+    Args:
+        steps: Steps making up the graph; every output must be unique
+        state_path: JSON file recording fingerprints between runs
+        workers: Maximum number of steps running at once
+    """
+
+    def __init__(self, steps=STEPS, state_path=STATE_PATH, workers=WORKERS):
+        self.steps = {step.name: step for step in steps}
+        self.producers = {step.output: step.name for step in steps}
+        if len(self.producers) != len(self.steps):
+            raise ValueError("Two pipeline steps write the same output")
+        self.state_path = state_path
+        self.workers = workers
+        self.state = self._load_state()
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def _load_state(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self):
+        tmp_path = self.state_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def dependencies(self, step):
+        return [self.producers[path] for path in step.inputs if path in self.producers]
+
+    def required(self, targets=None):
+        """Names of the target steps and everything upstream of them (all steps by default)."""
+        if targets is None:
+            return set(self.steps)
+        needed = set()
+        stack = list(targets)
+        while stack:
+            name = stack.pop()
+            if name not in self.steps:
+                raise KeyError(f"Unknown pipeline step: {name}")
+            if name not in needed:
+                needed.add(name)
+                stack.extend(self.dependencies(self.steps[name]))
+        return needed
+
+    def fingerprint(self, step, digests):
+        """Hash of the step's code (its module and local imports) and the content of its inputs."""
+        h = hashlib.sha256()
+        h.update(f"{step.module}.{step.function}".encode())
+        sources = set(step.source_paths())
+        for module in RUNNER_MODULES:
+            sources.update(local_sources(module))
+        for source in sorted(sources):
+            h.update(f"\0{os.path.basename(source)}\0{file_digest(source)}".encode())
+        for path in step.inputs:
+            digest = digests[path] if path in self.producers else file_digest(path)
+            h.update(f"\0{path}\0{digest}".encode())
+        return h.hexdigest()
+
+    def is_current(self, step, fingerprint):
+        recorded = self.state.get(step.name)
+        return (recorded is not None
+                and recorded["fingerprint"] == fingerprint
+                and os.path.exists(step.output)
+                and file_digest(step.output) == recorded["output_digest"])
+
+    def frame(self, path):
+        """A copy of the frame for path: from this run if a step produced it, else read from disk."""
+        with self._lock:
+            df = self._frames.get(path)
+        if df is None:
+            df = load_dataset(path)
+            with self._lock:
+                df = self._frames.setdefault(path, df)
+        # Steps must not see each other's in-place changes
+        return df.copy()
+
+    def _execute(self, step):
+        frames = [self.frame(path) for path in step.inputs]
+        df = step.load()(*frames)
+        df.to_csv(step.output, index=False)
+        with self._lock:
+            self._frames[step.output] = df
+        return file_digest(step.output)
+
+    def run(self, targets=None, force=False):
+        """
+        Bring the target steps (all by default) up to date.
+        Returns {step name: "ran" or "skipped"}.
+        """
+        pending = self.required(targets)
+        digests = {}
+        outcome = {}
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {}
+            while pending or running:
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for name in sorted(pending):
+                        step = self.steps[name]
+                        if any(dep not in outcome for dep in self.dependencies(step)):
+                            continue
+                        pending.discard(name)
+                        progressed = True
+                        fingerprint = self.fingerprint(step, digests)
+                        if not force and self.is_current(step, fingerprint):
+                            digests[step.output] = self.state[name]["output_digest"]
+                            outcome[name] = "skipped"
+                            print(f"[{name}] up to date")
+                        else:
+                            print(f"[{name}] running")
+                            running[pool.submit(self._execute, step)] = (step, fingerprint)
+
+                if not running:
+                    if pending:
+                        raise RuntimeError(f"Pipeline steps with missing dependencies: {sorted(pending)}")
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    step, fingerprint = running.pop(future)
+                    digest = future.result()
+                    digests[step.output] = digest
+                    outcome[step.name] = "ran"
+                    self.state[step.name] = {"fingerprint": fingerprint, "output_digest": digest}
+                    self._save_state()
+                    print(f"[{step.name}] wrote {step.output}")
+        return outcome
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the polysim indicator pipeline")
+    parser.add_argument("targets", nargs="*", help="Steps to bring up to date (default: all)")
+    parser.add_argument("--force", action="store_true", help="Rerun steps even if their inputs are unchanged")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="Steps to run in parallel")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    pipeline = Pipeline(workers=args.workers)
+    outcome = pipeline.run(args.targets or None, force=args.force)
+    ran = sum(1 for result in outcome.values() if result == "ran")
+    print(f"Pipeline complete: {ran} steps ran, {len(outcome) - ran} up to date")
+
+if __name__ == "__main__":
+    main()
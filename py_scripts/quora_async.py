@@ -0,0 +1,212 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+
+from quora_scraper import API_URL, HEADERS, QuoraScraper
+
+# ----- CONFIGURATION -----
+OUTPUT_PATH = "quora_answers.jsonl"
+# Cursor and progress of every question, so an interrupted run resumes where it stopped
+STATE_PATH = "quora_answers.state.json"
+REQUESTS_PER_SECOND = 0.5  # Shared by all questions
+CONCURRENCY = 4  # Questions scraped at once, and pooled connections
+PAGE_SIZE = 20
+MAX_ANSWERS = 100
+
+# ----- RATE LIMIT -----
+class RateLimiter:
+    """Spaces request starts at least 1/rate seconds apart across every task sharing it."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate
+        self._next = 0.0
+        self._lock = None
+
+    async def wait(self):
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            now = asyncio.get_running_loop().time()
+            if self._next > now:
+                await asyncio.sleep(self._next - now)
+                now = self._next
+            self._next = now + self.interval
+
+# ----- STATE -----
+class ScrapeState:
+    """
+    JSON record of each question's endCursor, answer count and completion, plus how many bytes
+    of the output file those answers account for. Answers are flushed before the state is saved,
+    so on resume anything past output_bytes belongs to a page whose cursor was never recorded
+    and is truncated away; that page is then fetched again.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        self.output_bytes = data.get("output_bytes", 0)
+        self.questions = data.get("questions", {})
+
+    def reset(self):
+        """Forget every question's progress, e.g. because the answers it describes are gone."""
+        self.output_bytes = 0
+        self.questions = {}
+        self.save()
+
+    def question(self, question_id):
+        return self.questions.setdefault(question_id, {"cursor": None, "answers": 0, "done": False})
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"output_bytes": self.output_bytes, "questions": self.questions}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+# ----- SCRAPER -----
+class AsyncQuoraScraper:
+    """
+    Scrapes many questions concurrently over one pooled httpx connection pool.
+
+    Every request waits on a shared RateLimiter, so adding questions does not raise the request
+    rate. Each page is appended to a JSONL file as soon as it arrives and its endCursor recorded
+    in ScrapeState, so rerunning after an error or interruption skips finished questions and
+    resumes the others from their last page. Failed requests are retried with exponential
+    backoff; a question that still fails is reported and left resumable without stopping the rest.
+
+    Args:
+        output_path: JSONL file receiving one answer per line
+        state_path: JSON file holding cursors between runs
+        rate: Requests per second across all questions
+        concurrency: Questions in flight at once (and maximum open connections)
+        api_url: GraphQL endpoint, e.g. a local stub server
+        page_size: Answers requested per page
+        max_retries: Attempts after the first before a question counts as failed
+    """
+
+    def __init__(self, output_path=OUTPUT_PATH, state_path=STATE_PATH, rate=REQUESTS_PER_SECOND,
+                 concurrency=CONCURRENCY, api_url=API_URL, page_size=PAGE_SIZE,
+                 max_retries=3, base_delay=2.0, max_delay=60.0):
+        self.output_path = output_path
+        self.state = ScrapeState(state_path)
+        self.limiter = RateLimiter(rate)
+        self.concurrency = concurrency
+        self.api_url = api_url
+        self.page_size = page_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    async def fetch_page(self, client, question_id, cursor):
+        """One page of answers as parsed JSON, raising after the final retry."""
+        payload = QuoraScraper.build_payload(question_id, cursor, self.page_size)
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.wait()
+            try:
+                response = await client.post(self.api_url, json=payload)
+                response.raise_for_status()
+                return response.json()
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay *= 0.5 + random.random() / 2
+                print(f"[{question_id}] request failed ({e}); retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    def _write_page(self, out, question_id, answers):
+        progress = self.state.question(question_id)
+        for answer in answers:
+            progress["answers"] += 1
+            # Number answers across pages rather than restarting at 1 on every page
+            answer = dict(answer, question_id=question_id, answer_number=progress["answers"])
+            out.write(json.dumps(answer, ensure_ascii=False) + "\n")
+        out.flush()
+        self.state.output_bytes = out.tell()
+
+    async def scrape_question(self, client, out, question_id, max_answers):
+        progress = self.state.question(question_id)
+        while not progress["done"] and progress["answers"] < max_answers:
+            response_data = await self.fetch_page(client, question_id, progress["cursor"])
+            answers = QuoraScraper.extract_answers_from_response(response_data)
+            self._write_page(out, question_id, answers[:max_answers - progress["answers"]])
+            progress["cursor"] = QuoraScraper.end_cursor(response_data)
+            progress["done"] = not answers or not progress["cursor"]
+            progress.pop("error", None)
+            self.state.save()
+        print(f"[{question_id}] {progress['answers']} answers")
+
+    async def scrape(self, urls, max_answers=MAX_ANSWERS):
+        """
+        Scrape every question URL (or ID) into the JSONL file.
+        Returns {question_id: error message} for questions that failed this run.
+        """
+        import httpx
+
+        question_ids = list(dict.fromkeys(QuoraScraper.get_question_id(url) for url in urls))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        failed = {}
+
+        # The state only describes answers that are still on disk; if the file was deleted or cut
+        # short, resuming would skip questions whose answers are lost, so start over instead
+        size = os.path.getsize(self.output_path) if os.path.exists(self.output_path) else None
+        if self.state.output_bytes and (size is None or size < self.state.output_bytes):
+            print(f"{self.output_path} is missing or shorter than {self.state.path} records; "
+                  "discarding the saved progress and scraping from the start")
+            self.state.reset()
+            size = None
+
+        # Drop any answers written after the last saved cursor, then append
+        mode = "r+" if size is not None else "w"
+        with open(self.output_path, mode, encoding="utf-8", newline="\n") as out:
+            out.truncate(self.state.output_bytes)
+            out.seek(self.state.output_bytes)
+
+            async def run(client, question_id):
+                async with semaphore:
+                    try:
+                        await self.scrape_question(client, out, question_id, max_answers)
+                    except Exception as e:
+                        failed[question_id] = str(e)
+                        self.state.question(question_id)["error"] = str(e)
+                        self.state.save()
+                        print(f"[{question_id}] failed: {e}")
+
+            limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+            async with httpx.AsyncClient(headers=HEADERS, limits=limits, timeout=30.0) as client:
+                await asyncio.gather(*(run(client, question_id) for question_id in question_ids))
+        return failed
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape Quora answers for many questions into JSONL")
+    parser.add_argument("urls", nargs="*", help="Question URLs or IDs")
+    parser.add_argument("--questions-file", help="File with one question URL or ID per line")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    parser.add_argument("--state", default=STATE_PATH)
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND, help="Requests per second")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY)
+    parser.add_argument("--max-answers", type=int, default=MAX_ANSWERS, help="Per question")
+    parser.add_argument("--api-url", default=API_URL, help="GraphQL endpoint (e.g. a local stub server)")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    urls = list(args.urls)
+    if args.questions_file:
+        with open(args.questions_file, "r", encoding="utf-8") as f:
+            urls.extend(line.strip() for line in f if line.strip())
+    if not urls:
+        raise SystemExit("No questions given")
+
+    scraper = AsyncQuoraScraper(args.output, args.state, rate=args.rate,
+                                concurrency=args.concurrency, api_url=args.api_url)
+    failed = asyncio.run(scraper.scrape(urls, max_answers=args.max_answers))
+    print(f"Scraped {len(urls) - len(failed)} questions into {args.output}; {len(failed)} failed (rerun to resume)")
+
+if __name__ == "__main__":
+    main()
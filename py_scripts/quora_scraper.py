@@ -5,50 +5,64 @@ from datetime import datetime
 import time
 import random
 
+API_URL = "https://www.quora.com/graphql/gql_para_POST?q=QuestionAnswerPagedListQuery"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Referer': 'https://www.quora.com/',
+    'Origin': 'https://www.quora.com'
+}
+
 class QuoraScraper:
     def __init__(self):
         self.session = requests.Session()
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Referer': 'https://www.quora.com/',
-            'Origin': 'https://www.quora.com'
-        }
+        self.headers = dict(HEADERS)
         self.session.headers.update(self.headers)
     
-    def get_question_id(self, url):
+    @staticmethod
+    def get_question_id(url):
         """Extract the question ID from the URL"""
         # This is a simplified example - in reality, we'd need to get this from the page
         return url.split('/')[-1]
     
-    def get_answers(self, question_id, cursor=None, limit=20):
-        """Get answers using Quora's GraphQL API"""
-        api_url = "https://www.quora.com/graphql/gql_para_POST?q=QuestionAnswerPagedListQuery"
-        
+    @staticmethod
+    def build_payload(question_id, cursor=None, limit=20):
+        """GraphQL payload requesting one page of a question's answers"""
         variables = {
             "questionId": question_id,
             "first": limit,
             "after": cursor
         }
         
-        payload = {
+        return {
             "queryName": "QuestionAnswerPagedListQuery",
             "variables": json.dumps(variables),
             "extensions": {
                 "hash": "graphql_query_hash"  # This would need to be updated with the correct hash
             }
         }
+    
+    @staticmethod
+    def end_cursor(response_data):
+        """Cursor of the next page, or None on the last page"""
+        # This would need to be extracted from the response
+        return response_data.get('data', {}).get('question', {}).get('answers', {}).get('pageInfo', {}).get('endCursor')
+    
+    def get_answers(self, question_id, cursor=None, limit=20):
+        """Get answers using Quora's GraphQL API"""
+        payload = self.build_payload(question_id, cursor, limit)
         
         try:
-            response = self.session.post(api_url, json=payload)
+            response = self.session.post(API_URL, json=payload)
             response.raise_for_status()
             return response.json()
         except Exception as e:
             print(f"Error fetching answers: {e}")
             return None
     
-    def extract_answers_from_response(self, response_data):
+    @staticmethod
+    def extract_answers_from_response(response_data):
         """Extract answers from the API response"""
         answers = []
         
@@ -114,8 +128,7 @@ class QuoraScraper:
                 all_answers.extend(new_answers)
                 
                 # Update cursor for next page
-                # This would need to be extracted from the response
-                cursor = response_data.get('data', {}).get('question', {}).get('answers', {}).get('pageInfo', {}).get('endCursor')
+                cursor = self.end_cursor(response_data)
                 
                 if not cursor:
                     break
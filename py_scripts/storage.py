@@ -0,0 +1,219 @@
+import csv
+import os
+import re
+import sys
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# ----- CONFIGURATION -----
+PARQUET_COMPRESSION = "zstd"
+# Records buffered per Parquet row group by write_records
+RECORDS_PER_BATCH = 10_000
+
+# ----- SCHEMAS -----
+# Long free text, held in Arrow buffers instead of one Python object per row (missing values
+# stay NaN, as with pandas' default str dtype, so existing masks and isinstance checks still work)
+TEXT = pd.StringDtype("pyarrow", na_value=np.nan)
+# Column dtypes of each dataset family. Low-cardinality labels are categoricals (stored
+# dictionary-encoded in Parquet); nullable integer types keep missing values without float64.
+STORIES_SCHEMA = {
+    "Country": "category", "Themes": "category", "Cluster": "Int8",
+    "Story": TEXT, "Title": TEXT, "Caption": TEXT, "Headline": TEXT,
+}
+INDICATORS_SCHEMA = {
+    "Economy": "category", "Economy Code": "category", "Country Name": "category",
+    "Country Code": "category", "Indicator Name": "category", "Indicator Code": "category",
+    "Year": "Int16", "source_file": "category",
+}
+LAWS_SCHEMA = {
+    "Template": "category", "Region": "category", "Form of Violence": "category",
+    "Type of Measure": "category", "Country": "category", "Year": "Int16", "Title": TEXT,
+}
+DATASET_SCHEMAS = {"stories": STORIES_SCHEMA, "indicators": INDICATORS_SCHEMA, "laws": LAWS_SCHEMA}
+# Used when no dataset is named; the families agree on every column they share
+DEFAULT_SCHEMA = {**INDICATORS_SCHEMA, **LAWS_SCHEMA, **STORIES_SCHEMA}
+# Indicator value columns are named after the indicator, so they are typed by the unit in the name
+UNIT_DTYPES = [
+    (re.compile(r"\(1=yes; 0=no\)"), "Int8"),
+    (re.compile(r"%"), "float32"),
+]
+
+def parquet_path(path):
+    """The Parquet copy of a dataset: stories_final.csv -> stories_final.parquet."""
+    root, ext = os.path.splitext(path)
+    return path if ext == ".parquet" else root + ".parquet"
+
+def column_dtypes(columns, schema=None):
+    """The target dtype of each of columns that the schema (or a unit in its name) covers."""
+    schema = DEFAULT_SCHEMA if schema is None else DATASET_SCHEMAS.get(schema, schema)
+    dtypes = {}
+    for col in columns:
+        if col in schema:
+            dtypes[col] = schema[col]
+            continue
+        for pattern, dtype in UNIT_DTYPES:
+            if pattern.search(str(col)):
+                dtypes[col] = dtype
+                break
+    return dtypes
+
+def compact_frame(df, schema=None):
+    """
+    Convert df's columns in place to the compact dtypes of schema (a DATASET_SCHEMAS name or a
+    {column: dtype} dict; every known column by default) and return df.
+
+    Columns that do not hold what the schema expects are left as they are: categoricals only
+    replace plain strings (not e.g. lists of themes), and a column of non-integral or
+    out-of-range numbers keeps its original dtype instead of being truncated.
+    """
+    for col, dtype in column_dtypes(df.columns, schema).items():
+        if df[col].dtype == dtype:
+            continue
+        if dtype in ("category", TEXT) and pd.api.types.infer_dtype(df[col], skipna=True) not in ("string", "empty"):
+            continue
+        try:
+            df[col] = df[col].astype(dtype)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    return df
+
+# ----- WRITE -----
+# Parquet key-value metadata recording the CSV a copy was made from, as "size:mtime_ns"
+SOURCE_CSV_KEY = b"source_csv"
+
+def _csv_signature(path):
+    stat = os.stat(path)
+    return f"{stat.st_size}:{stat.st_mtime_ns}".encode()
+
+def _write_parquet(df, target, source_csv=None):
+    """Write df to target atomically, recording source_csv's signature when given."""
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if source_csv is not None:
+        metadata = dict(table.schema.metadata or {})
+        metadata[SOURCE_CSV_KEY] = _csv_signature(source_csv)
+        table = table.replace_schema_metadata(metadata)
+    tmp_path = target + ".tmp"
+    try:
+        pq.write_table(table, tmp_path, compression=PARQUET_COMPRESSION)
+        os.replace(tmp_path, target)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def save_dataset(df, path, export_csv=True):
+    """
+    Write df as Parquet next to path (in its compact schema dtypes, zstd-compressed).
+    With export_csv and a .csv path, the CSV is written first for tools that still read it,
+    and the Parquet copy records which CSV it matches (see load_dataset).
+    """
+    target = parquet_path(path)
+    source_csv = None
+    if export_csv and target != path:
+        df.to_csv(path, index=False)
+        source_csv = path
+    _write_parquet(compact_frame(df.copy(deep=False)), target, source_csv)
+    return target
+
+def _arrow_type(dtype):
+    return pa.type_for_alias(dtype) if isinstance(dtype, str) else dtype
+
+def write_records(records, path, fieldnames, types=None, batch_size=RECORDS_PER_BATCH):
+    """
+    Stream an iterable of dicts to path without collecting them first; returns the count.
+
+    A .parquet path is written one row group per batch_size records, with one column per
+    fieldname typed by types ({fieldname: Arrow type or alias such as "int64"}; strings
+    otherwise), so a batch where a column happens to be all None cannot change the schema. Any
+    other path is written as CSV row by row. Nothing is left at path or path + ".tmp" on error.
+    """
+    types = types or {}
+    count = 0
+    tmp_path = path + ".tmp"
+    try:
+        if os.path.splitext(path)[1] == ".parquet":
+            schema = pa.schema([(name, _arrow_type(types.get(name, "string"))) for name in fieldnames])
+            records = iter(records)
+            with pq.ParquetWriter(tmp_path, schema, compression=PARQUET_COMPRESSION) as writer:
+                while True:
+                    batch = list(islice(records, batch_size))
+                    if not batch:
+                        break
+                    rows = [{name: record.get(name) for name in fieldnames} for record in batch]
+                    writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                    count += len(rows)
+        else:
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore", lineterminator="\n")
+                writer.writeheader()
+                for record in records:
+                    writer.writerow(record)
+                    count += 1
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return count
+
+# ----- READ -----
+def _has_current_parquet(path):
+    """
+    True if path has a Parquet copy that still matches the CSV: the CSV is gone, or has the size
+    and modification time recorded when the copy was made (so a CSV edited elsewhere wins).
+    Copies without that record fall back to comparing modification times.
+    """
+    target = parquet_path(path)
+    if not os.path.exists(target):
+        return False
+    if target == path or not os.path.exists(path):
+        return True
+    recorded = (pq.read_schema(target).metadata or {}).get(SOURCE_CSV_KEY)
+    if recorded is not None:
+        return recorded == _csv_signature(path)
+    return os.path.getmtime(target) >= os.path.getmtime(path)
+
+def load_dataset(path, columns=None, nrows=None, schema=None, **csv_kwargs):
+    """
+    Read a dataset, preferring its Parquet copy, with its columns in compact dtypes.
+
+    Only the requested columns are read from Parquet (projection pushdown), and with nrows only
+    the first row groups are decoded. Without a current Parquet copy the CSV at path is read with
+    the same column and row limits; csv_kwargs (encoding, etc.) apply to that fallback only.
+    schema names the dataset family in DATASET_SCHEMAS (or is a {column: dtype} dict); see
+    compact_frame.
+    """
+    if not _has_current_parquet(path):
+        df = pd.read_csv(path, usecols=columns, nrows=nrows, **csv_kwargs)
+    elif nrows is None:
+        df = pd.read_parquet(parquet_path(path), columns=columns)
+    else:
+        # A batch never spans row groups, so small row groups take several batches to reach nrows
+        parquet_file = pq.ParquetFile(parquet_path(path))
+        batches, count = [], 0
+        for batch in parquet_file.iter_batches(batch_size=nrows, columns=columns):
+            batches.append(batch)
+            count += batch.num_rows
+            if count >= nrows:
+                break
+        if batches:
+            table = pa.Table.from_batches(batches)
+        else:
+            table = parquet_file.schema_arrow.empty_table()
+            if columns is not None:
+                table = table.select(columns)
+        df = table.slice(0, nrows).to_pandas()
+    return compact_frame(df, schema)
+
+def convert_csv(path, **csv_kwargs):
+    """Store an existing CSV dataset as Parquet alongside it; returns the Parquet path."""
+    target = parquet_path(path)
+    _write_parquet(compact_frame(pd.read_csv(path, **csv_kwargs)), target, source_csv=path)
+    return target
+
+if __name__ == "__main__":
+    # python storage.py stories_final.csv ... converts each CSV to Parquet
+    for csv_file in sys.argv[1:]:
+        print(f"{csv_file} -> {convert_csv(csv_file)}")
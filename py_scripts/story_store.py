@@ -0,0 +1,252 @@
+import argparse
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+# ----- CONFIGURATION -----
+STORE_PATH = os.getenv("STORY_STORE_PATH", "stories.sqlite3")
+# Columns kept for every story, in export order; all but Story may be missing
+STORE_COLUMNS = ["Country", "Story", "Title", "Caption", "Themes", "Cluster"]
+IMPORT_CHUNK_SIZE = 5_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stories (
+    id INTEGER PRIMARY KEY,
+    story_key TEXT NOT NULL UNIQUE,
+    Country TEXT,
+    Story TEXT NOT NULL,
+    Title TEXT,
+    Caption TEXT,
+    Themes TEXT,
+    Cluster INTEGER,
+    source TEXT,
+    updated REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stories_country ON stories (Country);
+CREATE VIRTUAL TABLE IF NOT EXISTS stories_fts USING fts5(
+    Story, content='stories', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS stories_ai AFTER INSERT ON stories BEGIN
+    INSERT INTO stories_fts (rowid, Story) VALUES (new.id, new.Story);
+END;
+CREATE TRIGGER IF NOT EXISTS stories_ad AFTER DELETE ON stories BEGIN
+    INSERT INTO stories_fts (stories_fts, rowid, Story) VALUES ('delete', old.id, old.Story);
+END;
+CREATE TRIGGER IF NOT EXISTS stories_au AFTER UPDATE OF Story ON stories BEGIN
+    INSERT INTO stories_fts (stories_fts, rowid, Story) VALUES ('delete', old.id, old.Story);
+    INSERT INTO stories_fts (rowid, Story) VALUES (new.id, new.Story);
+END;
+"""
+
+def story_key(story):
+    """Identity of a story across files: a hash of its text with whitespace collapsed."""
+    return hashlib.sha256(" ".join(story.split()).encode("utf-8")).hexdigest()
+
+def match_query(text):
+    """FTS5 query requiring every word of text, with FTS5 operators and punctuation neutralised."""
+    return " ".join(f'"{word}"' for word in re.findall(r"\w+", text))
+
+def _value(value):
+    """A cell as stored in SQLite: missing values become NULL, numpy scalars plain Python."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    return value.item() if hasattr(value, "item") else value
+
+# ----- STORE -----
+class StoryStore:
+    """
+    SQLite system of record for the story corpus: one row per distinct story with its derived
+    columns, plus an FTS5 index over Story kept in sync by triggers.
+
+    Stories are identified by story_key, so the same story imported from several CSVs is one
+    row. Upserts only overwrite a column with a non-missing value, so importing a file without
+    Titles never erases Titles that another file provided. Safe to share between threads.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ----- WRITE -----
+    def upsert(self, records, source=None):
+        """
+        Insert or update stories from an iterable of dicts with STORE_COLUMNS keys (Story required;
+        records without a Story are skipped). Runs as one transaction; returns the number written.
+        """
+        assignments = ", ".join(
+            f"{col} = COALESCE(excluded.{col}, stories.{col})" for col in STORE_COLUMNS if col != "Story"
+        )
+        sql = (
+            f"INSERT INTO stories (story_key, {', '.join(STORE_COLUMNS)}, source, updated)"
+            f" VALUES ({', '.join('?' * (len(STORE_COLUMNS) + 3))})"
+            f" ON CONFLICT (story_key) DO UPDATE SET {assignments},"
+            " source = COALESCE(excluded.source, stories.source), updated = excluded.updated"
+        )
+        now = time.time()
+        rows = []
+        for record in records:
+            story = _value(record.get("Story"))
+            if not isinstance(story, str) or not story.strip():
+                continue
+            values = [_value(record.get(col)) for col in STORE_COLUMNS]
+            rows.append((story_key(story), *values, source, now))
+        with self.lock, self.conn:
+            self.conn.executemany(sql, rows)
+        return len(rows)
+
+    def upsert_frame(self, df, source=None):
+        """upsert the rows of a DataFrame; columns outside STORE_COLUMNS are ignored."""
+        columns = [col for col in STORE_COLUMNS if col in df.columns]
+        return self.upsert(df[columns].to_dict("records"), source=source)
+
+    def update(self, story_id, **fields):
+        """
+        Set columns of one story by id, e.g. update(12, Title="...", Cluster=3).
+        Raises ValueError if a new Story is already stored as another row.
+        """
+        unknown = set(fields) - set(STORE_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown story columns: {sorted(unknown)}")
+        if "Story" in fields:
+            fields["story_key"] = story_key(fields["Story"])
+        fields["updated"] = time.time()
+        assignments = ", ".join(f"{col} = ?" for col in fields)
+        try:
+            with self.lock, self.conn:
+                cursor = self.conn.execute(
+                    f"UPDATE stories SET {assignments} WHERE id = ?", [_value(v) for v in fields.values()] + [story_id]
+                )
+        except sqlite3.IntegrityError:
+            existing = self.find(fields["Story"]) if "Story" in fields else None
+            if existing is None:
+                raise
+            raise ValueError(f"Story {story_id} cannot take the text of story {existing['id']}; delete one of them first")
+        return cursor.rowcount
+
+    def delete(self, story_id):
+        with self.lock, self.conn:
+            return self.conn.execute("DELETE FROM stories WHERE id = ?", (story_id,)).rowcount
+
+    def rebuild_index(self):
+        """Rebuild the full-text index from the stories table (e.g. after editing the file directly)."""
+        with self.lock, self.conn:
+            self.conn.execute("INSERT INTO stories_fts (stories_fts) VALUES ('rebuild')")
+
+    # ----- READ -----
+    def get(self, story_id):
+        """The story with id as a dict, or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM stories WHERE id = ?", (story_id,)).fetchone()
+        return dict(row) if row is not None else None
+
+    def find(self, story):
+        """The stored record for a story's text (whitespace-insensitive), or None."""
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM stories WHERE story_key = ?", (story_key(story),)).fetchone()
+        return dict(row) if row is not None else None
+
+    def search(self, text, country=None, limit=20, raw=False):
+        """
+        Stories matching text, best first (BM25). Every word must appear, with stemming
+        (salary matches salaries); raw=True passes text through as an FTS5 query instead.
+        """
+        sql = (
+            "SELECT stories.*, bm25(stories_fts) AS rank FROM stories_fts"
+            " JOIN stories ON stories.id = stories_fts.rowid"
+            " WHERE stories_fts MATCH ?"
+        )
+        query = text if raw else match_query(text)
+        if not query.strip():
+            return []
+        params = [query]
+        if country is not None:
+            sql += " AND stories.Country = ?"
+            params.append(country)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def count(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM stories").fetchone()[0]
+
+    def to_frame(self, columns=STORE_COLUMNS, country=None):
+        """The stories as a DataFrame in insertion order, optionally for one country only."""
+        unknown = set(columns) - set(STORE_COLUMNS) - {"id", "source", "updated"}
+        if unknown:
+            raise ValueError(f"Unknown story columns: {sorted(unknown)}")
+        sql = f"SELECT {', '.join(columns)} FROM stories"
+        params = []
+        if country is not None:
+            sql += " WHERE Country = ?"
+            params.append(country)
+        with self.lock:
+            df = pd.read_sql_query(sql + " ORDER BY id", self.conn, params=params)
+        if "Cluster" in df.columns:
+            df["Cluster"] = df["Cluster"].astype("Int64")
+        return df
+
+    # ----- CSV -----
+    def import_csv(self, path, chunksize=IMPORT_CHUNK_SIZE, **csv_kwargs):
+        """Upsert every story in a CSV, read in chunks; the file name is recorded as the source."""
+        total = 0
+        for chunk in pd.read_csv(path, chunksize=chunksize, **csv_kwargs):
+            total += self.upsert_frame(chunk, source=os.path.basename(path))
+        return total
+
+    def export_csv(self, path, columns=STORE_COLUMNS, country=None):
+        """Write the stories to a CSV for scripts that still read one; returns the row count."""
+        df = self.to_frame(columns, country=country)
+        df.to_csv(path, index=False)
+        return len(df)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the SQLite story store")
+    parser.add_argument("--db", default=STORE_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    import_parser = commands.add_parser("import", help="Upsert stories from CSV files, in order")
+    import_parser.add_argument("paths", nargs="+")
+    import_parser.add_argument("--encoding", default="utf-8-sig")
+    export_parser = commands.add_parser("export", help="Write the stories to a CSV")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--country")
+    search_parser = commands.add_parser("search", help="Full-text search over Story")
+    search_parser.add_argument("text")
+    search_parser.add_argument("--country")
+    search_parser.add_argument("--limit", type=int, default=20)
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = StoryStore(args.db)
+    try:
+        if args.command == "import":
+            for path in args.paths:
+                count = store.import_csv(path, encoding=args.encoding, encoding_errors="replace")
+                print(f"{path}: {count} stories upserted")
+            print(f"{store.count()} stories in {args.db}")
+        elif args.command == "export":
+            print(f"Exported {store.export_csv(args.path, country=args.country)} stories to {args.path}")
+        else:
+            for row in store.search(args.text, country=args.country, limit=args.limit):
+                print(f"[{row['id']}] {row['Country']} | {row['Title'] or ''} | {' '.join(row['Story'].split())[:100]}")
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
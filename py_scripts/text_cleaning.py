@@ -0,0 +1,102 @@
+import codecs
+import os
+import re
+
+import pandas as pd
+
+# Typographic punctuation that NFKC leaves alone, folded to its ASCII form
+SMART_PUNCTUATION = str.maketrans({
+    '‘': "'", '’': "'", '‚': "'", '‛': "'", '′': "'",
+    '“': '"', '”': '"', '„': '"', '‟': '"', '″': '"',
+    '–': '-', '—': '-', '―': '-', '−': '-',
+})
+
+# UTF-8 text that was decoded as cp1252 shows up as a lead character (Â, Ã, â, ...) followed by
+# one that cp1252 produces for a UTF-8 continuation byte (0x80-0xBF), e.g. "JosÃ©" or "donâ€™t"
+MOJIBAKE = re.compile(
+    '[Â-ô][\u0080-¿ŒœŠšŸŽžƒˆ˜'
+    '–—‘-„†-•…‰‹›€™]'
+)
+
+CHUNK_SIZE = 50_000
+
+# Decoding error handler for files that mix UTF-8 with cp1252: every byte that is not valid UTF-8
+# is decoded on its own as cp1252 (U+FFFD for the few bytes cp1252 leaves undefined, e.g. 0x9D)
+CP1252_FALLBACK = 'cp1252_fallback'
+
+def _cp1252_fallback(error):
+    if not isinstance(error, UnicodeDecodeError):
+        raise error
+    byte = error.object[error.start:error.start + 1]
+    try:
+        return byte.decode('cp1252'), error.start + 1
+    except UnicodeDecodeError:
+        return '\ufffd', error.start + 1
+
+codecs.register_error(CP1252_FALLBACK, _cp1252_fallback)
+
+def _undo_mojibake(text):
+    try:
+        return text.encode('cp1252').decode('utf-8')
+    except UnicodeError:
+        return text
+
+def repair_mojibake(series):
+    """
+    Re-decode cells that look like UTF-8 read as cp1252. Only cells matching MOJIBAKE go through
+    Python; cells that do not round-trip cleanly are left unchanged.
+    """
+    suspect = series.str.contains(MOJIBAKE, na=False)
+    if suspect.any():
+        series = series.copy()
+        series[suspect] = series[suspect].map(_undo_mojibake)
+    return series
+
+def clean_series(series, normalize=True, ascii_only=False, repair=True):
+    """
+    Clean a column of strings with vectorised .str operations; missing values stay missing.
+
+    Args:
+        repair: Fix UTF-8/cp1252 mojibake first
+        normalize: Apply NFKC and fold smart quotes and dashes to ASCII
+        ascii_only: Drop what is still non-ASCII; accents are removed from letters first
+            (NFKD), so "José" becomes "Jose" rather than "Jos"
+    """
+    series = series.astype(object)
+    if repair:
+        series = repair_mojibake(series)
+    if normalize:
+        series = series.str.normalize('NFKC').str.translate(SMART_PUNCTUATION)
+    if ascii_only:
+        series = series.str.normalize('NFKD').str.encode('ascii', 'ignore').str.decode('ascii')
+    return series
+
+def clean_frame(df, **kwargs):
+    """Apply clean_series to every text column of df, one column at a time."""
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        df[col] = clean_series(df[col], **kwargs)
+    return df
+
+def clean_csv(input_path, output_path, encoding='utf-8', encoding_errors=CP1252_FALLBACK,
+              chunksize=CHUNK_SIZE, **kwargs):
+    """
+    Clean a CSV chunk by chunk and write it as UTF-8, so memory use does not grow with the file.
+    Every cell is read as text, so numbers and dates are written back exactly as they were.
+    By default bytes that are not valid UTF-8 are read as cp1252 (see CP1252_FALLBACK).
+    The output only replaces output_path once the whole file is cleaned.
+    Returns the number of rows written.
+    """
+    rows = 0
+    tmp_path = output_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', newline='', encoding='utf-8') as out:
+            chunks = pd.read_csv(input_path, encoding=encoding, encoding_errors=encoding_errors,
+                                 dtype=str, chunksize=chunksize)
+            for i, chunk in enumerate(chunks):
+                clean_frame(chunk, **kwargs).to_csv(out, index=False, header=(i == 0))
+                rows += len(chunk)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return rows
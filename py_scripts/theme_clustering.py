@@ -0,0 +1,121 @@
+import os
+
+import joblib
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics import silhouette_score
+
+# Fitted vectorizer + cluster model, reused by later runs to label new stories without refitting
+CLUSTER_MODEL_PATH = 'story_clusters.joblib'
+
+class StoryClusterer:
+    """
+    TF-IDF + MiniBatchKMeans clustering of stories that can be saved, reloaded and updated.
+
+    fit() learns the vocabulary and clusters from a corpus; partial_fit() updates the clusters
+    from further chunks using the already fitted vocabulary; predict() only transforms and assigns,
+    so newly scraped stories are labelled without touching the rest of the corpus.
+    """
+
+    def __init__(self, n_clusters=5, max_features=100, random_state=42, batch_size=1024):
+        self.n_clusters = n_clusters
+        self.vectorizer = TfidfVectorizer(max_features=max_features, stop_words='english')
+        self.model = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state,
+                                     batch_size=batch_size, n_init=3)
+        self.fitted = False
+
+    @staticmethod
+    def _texts(texts):
+        return [t if isinstance(t, str) else '' for t in texts]
+
+    def fit(self, texts):
+        """Fit vocabulary and clusters on texts and return their cluster labels."""
+        X = self.vectorizer.fit_transform(self._texts(texts))
+        labels = self.model.fit_predict(X)
+        self.fitted = True
+        return labels
+
+    def partial_fit(self, texts):
+        """
+        Update the clusters with one chunk of texts. The first chunk also fixes the vocabulary,
+        so it should be representative and contain at least n_clusters stories.
+        """
+        texts = self._texts(texts)
+        if not self.fitted:
+            X = self.vectorizer.fit_transform(texts)
+            self.fitted = True
+        else:
+            X = self.vectorizer.transform(texts)
+        self.model.partial_fit(X)
+        return self
+
+    def predict(self, texts):
+        """Assign texts to the nearest existing cluster without refitting anything."""
+        if not self.fitted:
+            raise ValueError("StoryClusterer must be fitted or loaded before predict()")
+        return self.model.predict(self.vectorizer.transform(self._texts(texts)))
+
+    def top_terms(self, n=10):
+        """The n highest-weighted vocabulary terms of each cluster centre."""
+        feature_names = self.vectorizer.get_feature_names_out()
+        return [[feature_names[i] for i in centre.argsort()[-n:][::-1]]
+                for centre in self.model.cluster_centers_]
+
+    def save(self, path=CLUSTER_MODEL_PATH):
+        joblib.dump(self, path)
+
+    @classmethod
+    def load(cls, path=CLUSTER_MODEL_PATH):
+        clusterer = joblib.load(path)
+        if not isinstance(clusterer, cls):
+            raise TypeError(f"{path} does not contain a {cls.__name__}")
+        return clusterer
+
+    @classmethod
+    def choose_k(cls, texts, candidates=range(3, 11), sample_size=2000, random_state=42, **kwargs):
+        """
+        Pick the number of clusters with the best silhouette score on a random sample of texts.
+        Each candidate is a quick MiniBatchKMeans fit, so this stays cheap on large corpora.
+        """
+        texts = cls._texts(texts)
+        rng = np.random.default_rng(random_state)
+        if len(texts) > sample_size:
+            texts = [texts[i] for i in rng.choice(len(texts), sample_size, replace=False)]
+
+        best_k, best_score = None, -1.0
+        for k in candidates:
+            if k >= len(texts):
+                break
+            clusterer = cls(n_clusters=k, random_state=random_state, **kwargs)
+            labels = clusterer.fit(texts)
+            if len(set(labels)) < 2:
+                continue
+            X = clusterer.vectorizer.transform(texts)
+            score = silhouette_score(X, labels, random_state=random_state)
+            print(f"k={k}: silhouette {score:.3f}")
+            if score > best_score:
+                best_k, best_score = k, score
+        if best_k is None:
+            raise ValueError("Not enough distinct stories to choose a cluster count")
+        return best_k
+
+def load_or_fit(texts, path=CLUSTER_MODEL_PATH, n_clusters=5, refit=False, choose_k=False):
+    """
+    Label texts with a persisted StoryClusterer, fitting and saving one first if none exists
+    at path (or refit is set). With choose_k, the cluster count comes from a silhouette sweep.
+    Returns (clusterer, labels).
+    """
+    if not refit and os.path.exists(path):
+        clusterer = StoryClusterer.load(path)
+        print(f"Loaded cluster model from {path}")
+        return clusterer, clusterer.predict(texts)
+
+    if choose_k:
+        n_clusters = StoryClusterer.choose_k(texts)
+        print(f"Chose {n_clusters} clusters by silhouette score")
+    clusterer = StoryClusterer(n_clusters=n_clusters)
+    labels = clusterer.fit(texts)
+    clusterer.save(path)
+    print(f"Saved cluster model to {path}")
+    return clusterer, labels
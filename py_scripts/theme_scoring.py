@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+# A second theme is kept when it scores at least this fraction of the top theme
+SECOND_THEME_RATIO = 0.5
+
+def keyword_vocabulary(theme_keywords):
+    """
+    Build the shared keyword vocabulary and a keyword x theme incidence matrix.
+    A keyword listed under several themes appears once in the vocabulary and counts for each of them.
+    """
+    themes = list(theme_keywords)
+    vocabulary = list(dict.fromkeys(k for keywords in theme_keywords.values() for k in keywords))
+    position = {keyword: i for i, keyword in enumerate(vocabulary)}
+    incidence = np.zeros((len(vocabulary), len(themes)), dtype=np.int32)
+    for j, theme in enumerate(themes):
+        for keyword in theme_keywords[theme]:
+            incidence[position[keyword], j] += 1
+    return themes, vocabulary, incidence
+
+def score_themes(stories, theme_keywords):
+    """
+    Count, for every story and theme, how many of the theme's keywords occur in the story.
+
+    Identical stories are scored once. Each vocabulary keyword is tested once per distinct story
+    with the same case-insensitive `keyword in story` check as before (CPython's substring search
+    outruns pandas' .str.contains here), giving a story x keyword matrix that is multiplied by the
+    keyword x theme incidence matrix.
+    Returns (themes, scores) where scores has shape (len(stories), len(themes)).
+    """
+    themes, vocabulary, incidence = keyword_vocabulary(theme_keywords)
+    codes, unique_stories = pd.factorize(pd.Series(stories).fillna('').astype(str))
+    lowered = [story.lower() for story in unique_stories]
+
+    present = np.empty((len(lowered), len(vocabulary)), dtype=np.int32)
+    for i, keyword in enumerate(vocabulary):
+        present[:, i] = np.fromiter((keyword in story for story in lowered), dtype=bool, count=len(lowered))
+    return themes, (present @ incidence)[codes]
+
+def select_themes(themes, scores):
+    """
+    Pick the best 1-2 themes per story from a score matrix.
+    The top theme is always kept; the runner-up is kept if it scores at least half as much.
+    Ties go to the theme listed first. Stories without any keyword get ['Other'].
+    """
+    if len(scores) == 0:
+        return []
+    # Stable sort keeps theme order among equal scores, like sorting the score dict
+    order = np.argsort(-scores, axis=1, kind='stable')
+    rows = np.arange(len(scores))
+    first = order[:, 0]
+    top = scores[rows, first]
+    if scores.shape[1] > 1:
+        second = order[:, 1]
+        runner_up = scores[rows, second]
+        keep_second = (runner_up > 0) & (runner_up >= top * SECOND_THEME_RATIO)
+    else:
+        second = first
+        keep_second = np.zeros(len(scores), dtype=bool)
+
+    selected = []
+    for t, f, s, k in zip(top, first, second, keep_second):
+        if t == 0:
+            selected.append(['Other'])
+        elif k:
+            selected.append([themes[f], themes[s]])
+        else:
+            selected.append([themes[f]])
+    return selected
+
+def assign_themes(stories, theme_keywords):
+    """Return the list of 1-2 themes for every story in a Series, in order."""
+    themes, scores = score_themes(stories, theme_keywords)
+    return select_themes(themes, scores)
+
+def theme_country_tally(df, theme_col='Themes', country_col='Country'):
+    """
+    Tally stories per (theme, country) in one explode + groupby pass.
+    Returns a tidy DataFrame with Theme, Country, Count and Percentage columns, where Percentage
+    is the share of all stories in df. Rows without a country are left out of the tally.
+    """
+    exploded = df[[theme_col, country_col]].explode(theme_col).dropna()
+    tally = (
+        exploded.groupby([theme_col, country_col], observed=True)
+                .size()
+                .rename('Count')
+                .reset_index()
+                .rename(columns={theme_col: 'Theme', country_col: 'Country'})
+    )
+    tally['Percentage'] = tally['Count'] / len(df) * 100 if len(df) else 0.0
+    return tally
@@ -1,14 +1,16 @@
 import pandas as pd
 import nltk
 from nltk.corpus import stopwords
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.cluster import KMeans
 import numpy as np
 from collections import Counter
 from nltk.tokenize import sent_tokenize
 from nltk.sentiment import SentimentIntensityAnalyzer
 import os
 
+from theme_clustering import CLUSTER_MODEL_PATH, load_or_fit
+from theme_scoring import assign_themes, theme_country_tally
+from storage import load_dataset, save_dataset
+
 # Create nltk_data directory in user home if it doesn't exist
 nltk_data_dir = os.path.join(os.path.expanduser("~"), "nltk_data")
 os.makedirs(nltk_data_dir, exist_ok=True)
@@ -33,11 +35,11 @@ except Exception as e:
     print(f"Error initializing SentimentIntensityAnalyzer: {str(e)}")
     sia = None
 
-# Read the CSV file
-df = pd.read_csv('csv-DBs\masterdb.csv')
+# Read only the columns used here (from the Parquet copy when there is a current one)
+df = load_dataset('csv-DBs\masterdb.csv', columns=['Country', 'Story'])
 
 # Standardize country names (rename "US" to "United States")
-df['Country'] = df['Country'].replace('US', 'United States')
+df['Country'] = df['Country'].astype(object).replace('US', 'United States')
 
 # Filter rows where:
 # 1. Country is not empty (not NaN and not an empty string)
@@ -60,36 +62,8 @@ theme_keywords = {
     'Identity': ['transgender', 'gender', 'identity', 'lgbtq', 'woman', 'man', 'girl', 'boy', 'feminine', 'masculine']
 }
 
-# Function to identify the best 1-2 themes in a story
-def identify_themes(story_text):
-    story_text = story_text.lower()
-    theme_scores = {}
-    
-    for theme, keywords in theme_keywords.items():
-        # Count how many keywords from each theme appear in the story
-        matches = sum(1 for keyword in keywords if keyword in story_text)
-        if matches > 0:
-            theme_scores[theme] = matches
-    
-    # If no themes found, return 'Other'
-    if not theme_scores:
-        return ['Other']
-    
-    # Sort themes by number of keyword matches (descending)
-    sorted_themes = sorted(theme_scores.items(), key=lambda x: x[1], reverse=True)
-    
-    # Take top 1-2 themes, depending on how many we found and their scores
-    if len(sorted_themes) == 1:
-        return [sorted_themes[0][0]]  # Return the only theme
-    else:
-        # If the second theme has at least half the score of the first theme, include it
-        if sorted_themes[1][1] >= sorted_themes[0][1] * 0.5:
-            return [sorted_themes[0][0], sorted_themes[1][0]]  # Return top 2
-        else:
-            return [sorted_themes[0][0]]  # Return only top theme
-
-# Apply theme identification to each story
-filtered_df['Themes'] = filtered_df['Story'].apply(identify_themes)
+# Identify the best 1-2 themes for every story in one vectorised pass
+filtered_df['Themes'] = pd.Series(assign_themes(filtered_df['Story'], theme_keywords), index=filtered_df.index, dtype=object)
 
 # Flatten the themes for counting
 all_themes = [theme for themes_list in filtered_df['Themes'] for theme in themes_list]
@@ -101,34 +75,33 @@ for theme, count in theme_counts.most_common():
     print(f"{theme}: {count} stories")
 
 # Optional: Use AI clustering to find additional themes
-# Extract features with TF-IDF
-vectorizer = TfidfVectorizer(max_features=100, stop_words='english')
-X = vectorizer.fit_transform(filtered_df['Story'].fillna(''))
-
-# Cluster the stories
+# The fitted TF-IDF vectorizer and MiniBatchKMeans model are saved to CLUSTER_MODEL_PATH; later runs
+# only assign stories to the saved clusters. Set REFIT_CLUSTERS to rebuild them, and CHOOSE_K to
+# pick the cluster count with a silhouette sweep instead of num_clusters.
 num_clusters = 5
-kmeans = KMeans(n_clusters=num_clusters, random_state=42)
-filtered_df['Cluster'] = kmeans.fit_predict(X)
+REFIT_CLUSTERS = False
+CHOOSE_K = False
+clusterer, labels = load_or_fit(filtered_df['Story'].fillna('').tolist(), CLUSTER_MODEL_PATH,
+                                n_clusters=num_clusters, refit=REFIT_CLUSTERS, choose_k=CHOOSE_K)
+filtered_df['Cluster'] = labels
 
 # Print most common words in each cluster
 print("\nAI-discovered themes (clusters):")
-feature_names = vectorizer.get_feature_names_out()
-for i in range(num_clusters):
+cluster_top_words = clusterer.top_terms(10)
+for i in range(clusterer.n_clusters):
     cluster_stories = filtered_df[filtered_df['Cluster'] == i]
     print(f"\nCluster {i} ({len(cluster_stories)} stories):")
     
     # Get the top words for this cluster
     if len(cluster_stories) > 0:
-        centroid = kmeans.cluster_centers_[i]
-        top_indices = centroid.argsort()[-10:][::-1]  # Get indices of top 10 words
-        top_words = [feature_names[ind] for ind in top_indices]
+        top_words = cluster_top_words[i]
         print(f"Top words: {', '.join(top_words)}")
         
         # Sample story from this cluster
         print(f"Sample story: {cluster_stories['Story'].iloc[0][:100]}...")
 
 # Save the results
-filtered_df.to_csv('stories_with_themes.csv', index=False)
+save_dataset(filtered_df, 'stories_with_themes.csv')
 
 # Print detailed theme tallies with percentages
 total_stories = len(filtered_df)
@@ -137,18 +110,10 @@ print(f"STORY TALLIES BY THEME (Total Stories: {total_stories})")
 print("="*50)
 
 # Get theme counts by country
-theme_by_country = {}
-for theme in set(all_themes):
-    theme_by_country[theme] = {}
-    for country in filtered_df['Country'].unique():
-        country_df = filtered_df[filtered_df['Country'] == country]
-        count = sum(1 for themes in country_df['Themes'] if theme in themes)
-        if count:
-            theme_by_country[theme][country] = count
+theme_by_country = theme_country_tally(filtered_df)
 
 # Print theme tallies by country
-for theme, countries in theme_by_country.items():
+for theme, rows in theme_by_country.groupby('Theme', sort=True):
     print(f"\nTheme: {theme}")
-    for country, count in sorted(countries.items()):
-        percentage = (count / total_stories) * 100
-        print(f"{country}: {count} stories ({percentage:.2f}%)")
\ No newline at end of file
+    for row in rows.itertuples(index=False):
+        print(f"{row.Country}: {row.Count} stories ({row.Percentage:.2f}%)")
\ No newline at end of file
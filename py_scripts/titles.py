@@ -1,8 +1,10 @@
-import pandas as pd
 import openai
 import os
 from dotenv import load_dotenv
 
+from llm_client import get_client
+from storage import load_dataset, save_dataset
+
 load_dotenv()  # Load variables from .env
 
 API_KEY = os.getenv('API_KEY')
@@ -35,22 +37,22 @@ def generate_headline(narrative):
         {"role": "user", "content": f"Narrative: {narrative}\nPreview:"}
     ]
     
-    response = openai.chat.completions.create(
-        model="gpt-3.5-turbo",  # Updated to a valid model name
+    # Repeated narratives are answered from the shared cache instead of a new request
+    headline = get_client().complete(
+        "gpt-3.5-turbo",  # Updated to a valid model name
         messages=messages,
         max_tokens=15,
         temperature=0.7,
         top_p=1.0,
         n=1
     )
-    headline = response.choices[0].message.content.strip()
     return headline
 
 # ----- MAIN PROCESSING FUNCTION -----
 def add_headline_column(input_file, output_file, num_rows):
     try:
-        # Read only the first 'num_rows' rows from the CSV file
-        df = pd.read_csv(input_file, encoding='utf-8', encoding_errors='ignore', nrows=num_rows)
+        # Read only the first 'num_rows' rows (from the Parquet copy when there is a current one)
+        df = load_dataset(input_file, nrows=num_rows, encoding='utf-8', encoding_errors='ignore')
     except Exception as e:
         print(f"Error reading the CSV file: {e}")
         return
@@ -69,10 +71,11 @@ def add_headline_column(input_file, output_file, num_rows):
             headline = ""
         df.at[index, "Headline"] = headline
         print(f"Row {index}: Headline set to: {headline}")
+    print(get_client().stats.summary())
 
     try:
-        df.to_csv(output_file, index=False)
-        print(f"Updated CSV file with headlines written to {output_file}")
+        save_dataset(df, output_file)
+        print(f"Updated file with headlines written to {output_file}")
     except Exception as e:
         print(f"Error writing CSV file: {e}")
 
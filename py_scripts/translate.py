@@ -1,36 +1,44 @@
 import csv
-from googletrans import Translator
-from langdetect import detect, LangDetectException
+
+from llm_client import SQLiteResponseCache
+from translation import TRANSLATION_CACHE_PATH, TranslationStage
 
 input_file = 'polysim/combined_data_with_laws.csv'
 output_file = 'polysim/combined_data_with_laws_translated.csv'
 
-translator = Translator()
-
-def is_english(text):
-    try:
-        return detect(text) == 'en'
-    except (LangDetectException, TypeError):
-        return True  # Treat as English if detection fails
-
-translated_count = 0
-
-with open(input_file, 'r', encoding='utf-8', errors='ignore') as infile, \
-     open(output_file, 'w', encoding='utf-8', newline='') as outfile:
-    reader = csv.reader(infile)
-    writer = csv.writer(outfile)
-    for row in reader:
-        try:
-            value = row[7]  # Column 8 (0-indexed)
-            if isinstance(value, str) and value.strip():
-                try:
-                    translated = translator.translate(value, dest='en').text
-                    row[7] = translated
-                    translated_count += 1
-                except Exception:
-                    pass  # Skip translation errors
-        except Exception:
-            pass  # Skip rows with issues
-        writer.writerow(row)
-
-print(f"Rows successfully translated: {translated_count}")
\ No newline at end of file
+# Column 8 (0-indexed 7) holds the text to translate
+TRANSLATE_COLUMN = 7
+
+def make_stage():
+    """Translation stage using the configured backend and the shared on-disk cache."""
+    return TranslationStage(cache=SQLiteResponseCache(TRANSLATION_CACHE_PATH))
+
+def report(stats):
+    print(stats.summary())
+    for text, error in stats.failed.items():
+        print(f"Failed to translate {text[:60]!r}: {error}")
+
+def translate_frame(df, column_index=TRANSLATE_COLUMN):
+    """Translate one column of a DataFrame to English, returning the updated copy."""
+    df, stats = make_stage().translate_column(df, df.columns[column_index])
+    report(stats)
+    return df
+
+if __name__ == "__main__":
+    with open(input_file, 'r', encoding='utf-8', errors='ignore') as infile:
+        rows = list(csv.reader(infile))
+
+    # Translate the data rows (the header is left alone); short rows have nothing to translate
+    values = [row[TRANSLATE_COLUMN] if len(row) > TRANSLATE_COLUMN else None for row in rows[1:]]
+    translations, stats = make_stage().translate_texts(values)
+    changed = 0
+    for row, original, value in zip(rows[1:], values, translations):
+        if value is not None:
+            row[TRANSLATE_COLUMN] = value
+            changed += value != original
+
+    with open(output_file, 'w', encoding='utf-8', newline='') as outfile:
+        csv.writer(outfile).writerows(rows)
+
+    report(stats)
+    print(f"Rows successfully translated: {changed}")
@@ -0,0 +1,186 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# ----- CONFIGURATION -----
+TRANSLATION_CACHE_PATH = os.getenv("TRANSLATION_CACHE_PATH", "translation_cache.sqlite3")
+# "googletrans" for real translations, "echo" for an offline stub that returns texts unchanged
+TRANSLATION_BACKEND = os.getenv("TRANSLATION_BACKEND", "googletrans")
+
+# ----- LANGUAGE DETECTION -----
+def is_english(text):
+    from langdetect import detect, LangDetectException
+    try:
+        return detect(text) == 'en'
+    except (LangDetectException, TypeError):
+        return True  # Treat as English if detection fails
+
+def english_mask(texts):
+    """is_english for a batch of texts, with a fixed seed so repeated runs agree."""
+    from langdetect import DetectorFactory
+    DetectorFactory.seed = 0
+    return [is_english(text) for text in texts]
+
+# ----- BACKENDS -----
+# A backend has a name and translate(texts, dest) -> list of translated texts in the same order.
+class GoogleTransBackend:
+    """googletrans, with one Translator per worker thread."""
+
+    name = "googletrans"
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def translate(self, texts, dest):
+        translator = getattr(self._local, "translator", None)
+        if translator is None:
+            from googletrans import Translator
+            translator = self._local.translator = Translator()
+        return [result.text for result in translator.translate(list(texts), dest=dest)]
+
+class EchoBackend:
+    """Offline stub: returns every text unchanged (optionally prefixed), for dry runs and tests."""
+
+    name = "echo"
+
+    def __init__(self, prefix=""):
+        self.prefix = prefix
+
+    def translate(self, texts, dest):
+        return [self.prefix + text for text in texts]
+
+BACKENDS = {"googletrans": GoogleTransBackend, "echo": EchoBackend}
+
+def make_backend(name=TRANSLATION_BACKEND):
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown translation backend {name!r}; choose from {sorted(BACKENDS)}")
+
+# ----- STAGE -----
+class TranslationStats:
+    def __init__(self):
+        self.texts = 0
+        self.unique = 0
+        self.english = 0
+        self.cached = 0
+        self.translated = 0
+        self.failed = {}  # text -> error message
+
+    def summary(self):
+        return (f"Translation: {self.texts} texts, {self.unique} unique, {self.english} already English, "
+                f"{self.cached} from cache, {self.translated} translated, {len(self.failed)} failed")
+
+class TranslationStage:
+    """
+    Translates texts to dest, paying for each distinct non-English text at most once.
+
+    Texts are deduplicated, looked up in the on-disk cache (keyed by a hash of backend, target
+    language and text), language-detected so English texts are skipped (and cached unchanged, so
+    a rerun finds every known text in the cache without detecting again), and the rest are sent
+    to the backend in batches on a bounded thread pool. Failed batches are retried with
+    exponential backoff; texts that still fail keep their original value and are reported in
+    stats.failed instead of being silently dropped.
+
+    Args:
+        backend: Object with a name and translate(texts, dest); defaults to TRANSLATION_BACKEND
+        cache: SQLiteResponseCache, or None to disable caching
+        dest: Target language code
+        concurrency: Batches in flight at once
+        batch_size: Texts per backend request
+        max_retries: Attempts after the first before a batch counts as failed
+    """
+
+    def __init__(self, backend=None, cache=None, dest="en", concurrency=4, batch_size=20,
+                 max_retries=3, base_delay=1.0, max_delay=30.0):
+        self.backend = backend if backend is not None else make_backend()
+        self.cache = cache
+        self.dest = dest
+        self.concurrency = concurrency
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+    def key(self, text):
+        payload = f"{self.backend.name}\0{self.dest}\0{text}"
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _translate_batch(self, batch):
+        for attempt in range(self.max_retries + 1):
+            try:
+                results = self.backend.translate(batch, self.dest)
+                if len(results) != len(batch):
+                    raise ValueError(f"backend returned {len(results)} results for {len(batch)} texts")
+                return results
+            except Exception as e:
+                if attempt == self.max_retries:
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay *= 0.5 + random.random() / 2
+                print(f"Translation batch failed ({e}); retrying in {delay:.1f}s")
+                time.sleep(delay)
+
+    def translate_texts(self, texts):
+        """
+        Translate a list of texts. Returns (translations, stats) where translations is aligned
+        with texts; empty, non-string, English and failed texts are returned unchanged.
+        """
+        stats = TranslationStats()
+        stats.texts = len(texts)
+        unique = list(dict.fromkeys(t for t in texts if isinstance(t, str) and t.strip()))
+        stats.unique = len(unique)
+        translations = {}
+
+        pending = []
+        for text in unique:
+            hit = self.cache.get(self.key(text)) if self.cache is not None else None
+            if hit is not None:
+                translations[text] = hit[0]
+                stats.cached += 1
+            else:
+                pending.append(text)
+
+        to_send = []
+        for text, english in zip(pending, english_mask(pending) if pending else []):
+            if not english:
+                to_send.append(text)
+            elif self.cache is not None:
+                # Cache English texts unchanged so later runs skip language detection for them too
+                self.cache.put(self.key(text), "langdetect", text, 0)
+        stats.english = len(pending) - len(to_send)
+
+        batches = [to_send[i:i + self.batch_size] for i in range(0, len(to_send), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            futures = [(batch, pool.submit(self._translate_batch, batch)) for batch in batches]
+            for batch, future in futures:
+                try:
+                    done = list(zip(batch, future.result()))
+                except Exception as e:
+                    if len(batch) == 1:
+                        stats.failed[batch[0]] = str(e)
+                        continue
+                    # Retry the texts one by one so one bad text does not fail its whole batch
+                    done = []
+                    for text in batch:
+                        try:
+                            done.append((text, self._translate_batch([text])[0]))
+                        except Exception as text_error:
+                            stats.failed[text] = str(text_error)
+                for text, translated in done:
+                    translations[text] = translated
+                    if self.cache is not None:
+                        self.cache.put(self.key(text), self.backend.name, translated, 0)
+                stats.translated += len(done)
+
+        return [translations.get(t, t) if isinstance(t, str) else t for t in texts], stats
+
+    def translate_column(self, df, column):
+        """Return a copy of df with column translated, and the stats."""
+        translations, stats = self.translate_texts(df[column].tolist())
+        df = df.copy()
+        df[column] = translations
+        return df, stats
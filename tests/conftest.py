@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The scripts are run from their own directories rather than installed, so import them the same way
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for script_dir in ("py_scripts", "ig_linked_db.py"):
+    path = os.path.join(ROOT, script_dir)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,46 @@
+import io
+
+import pandas as pd
+
+from buzzfeed_scraper import STORIES_TEXT, extract_stories, iter_stories
+
+def test_builtin_stories_are_numbered_and_unquoted():
+    stories = list(iter_stories(io.StringIO(STORIES_TEXT)))
+    assert [s["story_number"] for s in stories] == list(range(1, 24))
+    assert stories[3]["story_text"] == (
+        "Whenever I'm talking about my finance job, and I mention my boss, people always assume they're a man."
+    )
+    # Quotes inside a story are kept
+    assert stories[0]["story_text"].endswith("we'd all be married and pregnant.")
+    assert "'You won't need to know math after you graduate.'" in stories[0]["story_text"]
+
+def test_multi_paragraph_stories_with_curly_quotes():
+    text = (
+        "Intro paragraph that is not a story.\n"
+        "\n"
+        "1. “My first paragraph\n"
+        "wraps onto a second line.\n"
+        "\n"
+        "“The quote reopens for the second paragraph.”\n"
+        "2. \"Straight quotes, one line.\"\n"
+        "\n"
+        "\n"
+        "10. No quotes at all, and “quoted words” inside.\n"
+    )
+    stories = list(iter_stories(io.StringIO(text)))
+    assert stories == [
+        {"story_number": 1, "story_text":
+            "My first paragraph wraps onto a second line.\n\nThe quote reopens for the second paragraph."},
+        {"story_number": 2, "story_text": "Straight quotes, one line."},
+        {"story_number": 10, "story_text": "No quotes at all, and “quoted words” inside."},
+    ]
+
+def test_extract_stories_writes_parquet_and_csv(tmp_path):
+    source = tmp_path / "dump.txt"
+    source.write_text("1. “One.”\n\n2. “Two,\n\n“in two paragraphs.”\n", encoding="utf-8")
+    for name in ("stories.parquet", "stories.csv"):
+        output = tmp_path / name
+        assert extract_stories(str(source), str(output)) == 2
+        df = pd.read_parquet(output) if name.endswith(".parquet") else pd.read_csv(output)
+        assert df["story_number"].tolist() == [1, 2]
+        assert df["story_text"].tolist() == ["One.", "Two,\n\nin two paragraphs."]
@@ -0,0 +1,29 @@
+import pandas as pd
+
+import clean_combined
+from clean_combined import coalesce, format_combined
+from combined_db import combine_frames
+from storage import compact_frame
+
+PATHS = ["polysim\\processed_old.csv", "polysim\\processed_new.csv"]
+
+def combined():
+    old = pd.DataFrame({"Economy": ["Kenya", "India"], "Year": [2015, 2015], "Score": [1.0, None]})
+    new = pd.DataFrame({"Economy": ["Kenya", "India"], "Year": [2020, 2020], "Score": [2.0, 3.0]})
+    return compact_frame(combine_frames(old, new, paths=PATHS), "indicators")
+
+def test_without_precedence_the_earliest_source_wins():
+    df = coalesce(combined())
+    assert df["Economy"].tolist() == ["India", "Kenya"]
+    assert df["Year"].tolist() == [2015, 2015]
+    assert df["Score"].tolist() == [3.0, 1.0]
+
+def test_precedence_matches_file_names_of_windows_style_sources():
+    df = coalesce(combined(), precedence=["processed_new.csv"])
+    assert df["Year"].tolist() == [2020, 2020]
+    assert df["Score"].tolist() == [3.0, 2.0]
+
+def test_format_combined_uses_source_precedence(monkeypatch):
+    monkeypatch.setattr(clean_combined, "SOURCE_PRECEDENCE", ["processed_new.csv"])
+    assert format_combined(combined())["Year"].tolist() == [2020, 2020]
+    assert format_combined(combined(), precedence=["processed_old.csv"])["Year"].tolist() == [2015, 2015]
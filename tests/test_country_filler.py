@@ -0,0 +1,52 @@
+import glob
+import os
+import re
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("pycountry")
+pytest.importorskip("openai")  # imported by country_filler
+
+from country_filler import countries, country_matcher, synonyms
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def per_name_country(text):
+    """The original matcher: one regex search per synonym, then per official name."""
+    text_lower = text.lower()
+    for key, country in synonyms.items():
+        if re.search(r'\b' + re.escape(key) + r'\b', text_lower):
+            return country
+    for country in countries:
+        if re.search(r'\b' + re.escape(country.lower()) + r'\b', text_lower):
+            return country
+    return None
+
+def generated_texts():
+    texts = ["", "No place is named here.", "Usability is not the USA.", "the u.s.a.", "Nigeria, not Niger"]
+    names = list(synonyms) + countries
+    for i, name in enumerate(names):
+        other = names[(i * 7) % len(names)]
+        texts.append(f"I grew up in {name}.")
+        texts.append(f"After {other.upper()} we moved to {name}; later {name}-based work followed.")
+        texts.append(f"{name}{name[-1]} is not a country")
+    return texts
+
+def corpus_texts():
+    texts = []
+    for path in glob.glob(os.path.join(ROOT, "csv-DBs", "*.csv")):
+        df = pd.read_csv(path, encoding="utf-8", encoding_errors="ignore", dtype=str)
+        if "Story" in df.columns:
+            texts.extend(df["Story"].dropna())
+    return texts
+
+@pytest.mark.parametrize("texts", [generated_texts(), corpus_texts()], ids=["generated", "corpus"])
+def test_matcher_agrees_with_per_name_search(texts):
+    if not texts:
+        pytest.skip("no story CSVs checked out")
+    expected = [per_name_country(text) for text in texts]
+    assert [country_matcher.find(text) for text in texts] == expected
+
+    matched = country_matcher.match_series(pd.Series(texts))
+    assert [None if pd.isna(country) else country for country in matched] == expected
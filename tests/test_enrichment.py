@@ -0,0 +1,62 @@
+import asyncio
+import csv
+
+from enrichment import enrich_csv
+
+FIELDNAMES = ["Country", "Story"]
+
+def write_input(path, stories):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDNAMES)
+        for story in stories:
+            writer.writerow(["Kenya", story])
+
+def read_output(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return list(csv.DictReader(f))
+
+def run(input_csv, output_csv):
+    seen = []
+
+    async def caption(row):
+        seen.append(row["Story"])
+        return f"caption of {row['Story']}"
+
+    asyncio.run(enrich_csv(str(input_csv), str(output_csv), "Caption", caption, checkpoint_every=1))
+    return seen
+
+def test_resume_skips_matching_rows_and_drops_a_half_written_one(tmp_path):
+    input_csv, output_csv = tmp_path / "stories.csv", tmp_path / "captioned.csv"
+    stories = ["first", "second, with a comma", "third\nover two lines", "fourth"]
+    write_input(input_csv, stories)
+    with open(output_csv, "w", encoding="utf-8", newline="") as f:
+        f.write('Country,Story,Caption\r\nKenya,first,kept caption\r\n'
+                'Kenya,"second, with a comma",kept too\r\nKenya,"third\nover')
+
+    assert run(input_csv, output_csv) == stories[2:]
+    rows = read_output(output_csv)
+    assert [row["Story"] for row in rows] == stories
+    assert [row["Caption"] for row in rows] == [
+        "kept caption", "kept too", "caption of third\nover two lines", "caption of fourth",
+    ]
+
+def test_changed_input_starts_a_fresh_output(tmp_path):
+    input_csv, output_csv = tmp_path / "stories.csv", tmp_path / "captioned.csv"
+    write_input(input_csv, ["a", "b", "c"])
+    run(input_csv, output_csv)
+
+    # Reordered input: the old captions no longer line up with the rows
+    write_input(input_csv, ["b", "a", "c"])
+    assert run(input_csv, output_csv) == ["b", "a", "c"]
+    rows = read_output(output_csv)
+    assert [(row["Story"], row["Caption"]) for row in rows] == [
+        ("b", "caption of b"), ("a", "caption of a"), ("c", "caption of c"),
+    ]
+
+def test_finished_output_is_not_enriched_again(tmp_path):
+    input_csv, output_csv = tmp_path / "stories.csv", tmp_path / "captioned.csv"
+    write_input(input_csv, ["a", "b"])
+    assert run(input_csv, output_csv) == ["a", "b"]
+    assert run(input_csv, output_csv) == []
+    assert len(read_output(output_csv)) == 2
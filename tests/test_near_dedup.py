@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from near_dedup import candidate_pairs, drop_near_duplicates, near_duplicate_clusters
+
+STORY = (
+    "My manager passed me over for a promotion after I came back from maternity leave, even though "
+    "I had more accounts and fewer mistakes than anyone else on the team. Several people in the "
+    "company were shocked that I was not even given a chance to apply. When I asked for feedback I "
+    "was told that the role needed someone who could travel and stay late, which nobody had ever "
+    "asked me about. The man who got the job had joined two years after me and had half my "
+    "clients. I later found out that my manager, the director and the vice president had all "
+    "agreed that a new mother would not want the extra responsibility."
+)
+OTHER = (
+    "The bus driver refused to let girls sit at the front, so we stood for the whole trip to "
+    "school while the boys took every seat. When my mother complained, the school said it was "
+    "tradition and that girls should be used to it by now."
+)
+
+def test_near_duplicates_share_a_cluster():
+    stories = [
+        STORY,
+        STORY + " I left the company a year later.",
+        "  " + STORY.replace("manager", "Manager").replace(" ", "  "),
+        OTHER,
+    ]
+    assert near_duplicate_clusters(stories, threshold=0.8).tolist() == [0, 0, 0, 1]
+
+def test_drop_keeps_the_longest_text_of_each_cluster():
+    truncated = STORY[:len(STORY) * 9 // 10]
+    df = pd.DataFrame({"Country": ["Kenya", "Kenya", "India"], "Story": [truncated, STORY, OTHER]})
+    deduped = drop_near_duplicates(df, column="Story", threshold=0.8)
+    assert deduped["Story"].tolist() == [STORY, OTHER]
+    assert deduped["cluster_id"].tolist() == [0, 1]
+
+def test_distinct_stories_are_kept():
+    df = pd.DataFrame({"Story": [STORY, OTHER] + [f"Unrelated account {i}: {' '.join(str(i * k) for k in range(1, 30))}"
+                                                  for i in range(1, 9)]})
+    assert len(drop_near_duplicates(df, column="Story", threshold=0.8)) == 10
+
+def test_bucket_pairs_survive_a_dissimilar_text_sorted_between_them():
+    # Rows 0 and 2 agree on 26 of 30 values but share only the first band; row 1 shares that band
+    # too and sorts between them, while agreeing with neither anywhere else
+    near = np.ones(30, dtype=np.uint32)
+    duplicate = near.copy()
+    duplicate[[3, 6, 9, 12]] = 2
+    between = np.arange(100, 130, dtype=np.uint32)
+    between[:3] = 1
+    pairs = candidate_pairs(np.stack([near, between, duplicate]), rows=3, bands=5)
+    assert [0, 2] in pairs.tolist()
@@ -0,0 +1,16 @@
+import os
+
+from polysim_pipeline import RUNNER_MODULES, STEPS, local_sources
+
+def names(paths):
+    return {os.path.basename(path) for path in paths}
+
+def test_step_sources_follow_local_imports():
+    steps = {step.name: step for step in STEPS}
+    assert names(steps["translate"].source_paths()) >= {"translate.py", "translation.py", "llm_client.py"}
+    assert names(steps["legislation"].source_paths()) >= {"legislation.py", "storage.py"}
+
+def test_installed_packages_are_not_followed():
+    assert all(os.path.dirname(path) == os.path.dirname(local_sources("storage")[0])
+               for path in local_sources("legislation"))
+    assert "storage.py" in names(local_sources(RUNNER_MODULES[0]))
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("requests")  # imported by quora_scraper
+
+from quora_async import AsyncQuoraScraper
+
+ANSWERS_PER_QUESTION = 45
+PAGE_SIZE = 20
+
+class StubGraphQL:
+    """
+    Local stand-in for the Quora GraphQL endpoint: every question has ANSWERS_PER_QUESTION
+    answers, paged by an integer cursor. Questions in failing get HTTP 503 on every page after
+    their first.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.failing = set()
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                variables = json.loads(body["variables"])
+                question_id, start = variables["questionId"], int(variables["after"] or 0)
+                stub.requests.append((question_id, start))
+                if question_id in stub.failing and start > 0:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                end = min(ANSWERS_PER_QUESTION, start + variables["first"])
+                edges = [{"node": {"author": {"name": f"author {i}"}, "createdTime": "t",
+                                   "text": f"{question_id} answer {i}"}} for i in range(start, end)]
+                page_info = {"endCursor": str(end) if end < ANSWERS_PER_QUESTION else None}
+                data = json.dumps({"data": {"question": {"answers": {"edges": edges, "pageInfo": page_info}}}})
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data.encode())
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/graphql"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def stub():
+    server = StubGraphQL()
+    yield server
+    server.close()
+
+def make_scraper(tmp_path, stub):
+    return AsyncQuoraScraper(str(tmp_path / "answers.jsonl"), str(tmp_path / "state.json"), rate=1000,
+                             api_url=stub.url, page_size=PAGE_SIZE, max_retries=1, base_delay=0.01)
+
+def read_answers(tmp_path):
+    with open(tmp_path / "answers.jsonl", "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+def test_scrape_streams_every_answer_numbered_across_pages(tmp_path, stub):
+    failed = asyncio.run(make_scraper(tmp_path, stub).scrape(["q1", "q2"]))
+    assert failed == {}
+    answers = read_answers(tmp_path)
+    for question_id in ("q1", "q2"):
+        numbers = [a["answer_number"] for a in answers if a["question_id"] == question_id]
+        assert numbers == list(range(1, ANSWERS_PER_QUESTION + 1))
+
+def test_failed_question_resumes_from_its_saved_cursor(tmp_path, stub):
+    stub.failing.add("q2")
+    failed = asyncio.run(make_scraper(tmp_path, stub).scrape(["q1", "q2"]))
+    assert list(failed) == ["q2"]
+    assert len(read_answers(tmp_path)) == ANSWERS_PER_QUESTION + PAGE_SIZE
+
+    # A page written after the last saved cursor (e.g. the run was killed mid-save) is discarded
+    with open(tmp_path / "answers.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"question_id": "partial"}\n')
+
+    stub.failing.clear()
+    stub.requests.clear()
+    assert asyncio.run(make_scraper(tmp_path, stub).scrape(["q1", "q2"])) == {}
+    # q1 was finished and q2 resumes after its first page
+    assert stub.requests == [("q2", 20), ("q2", 40)]
+    texts = [a["text"] for a in read_answers(tmp_path)]
+    assert len(texts) == len(set(texts)) == 2 * ANSWERS_PER_QUESTION
+
+def test_missing_output_restarts_from_scratch(tmp_path, stub):
+    asyncio.run(make_scraper(tmp_path, stub).scrape(["q1"]))
+    (tmp_path / "answers.jsonl").unlink()
+
+    asyncio.run(make_scraper(tmp_path, stub).scrape(["q1"]))
+    with open(tmp_path / "answers.jsonl", "rb") as f:
+        assert b"\0" not in f.read()
+    assert len(read_answers(tmp_path)) == ANSWERS_PER_QUESTION
@@ -0,0 +1,50 @@
+import os
+
+from render_manifest import MISSING_DIGEST, RenderManifest, file_digest, slide_digest
+
+def write(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+    return str(path)
+
+def test_slide_digest_is_stable_for_same_inputs(tmp_path):
+    font = write(tmp_path / "font.ttf", b"font")
+    inputs = {"kind": "content", "text": "A sentence.", "size": 30}
+    assert slide_digest(inputs, files=[font]) == slide_digest(dict(inputs), files=[font])
+
+def test_slide_digest_changes_with_inputs_and_file_contents(tmp_path):
+    font = write(tmp_path / "font.ttf", b"font")
+    inputs = {"kind": "content", "text": "A sentence.", "size": 30}
+    digest = slide_digest(inputs, files=[font])
+    assert slide_digest(dict(inputs, size=31), files=[font]) != digest
+
+    write(font, b"another font")
+    os.utime(font, ns=(1, 1))  # a new mtime even on filesystems with coarse timestamps
+    assert slide_digest(inputs, files=[font]) != digest
+
+def test_missing_file_hashes_to_placeholder(tmp_path):
+    missing = str(tmp_path / "Bold.ttf")
+    assert file_digest(missing) == MISSING_DIGEST
+    inputs = {"kind": "title"}
+    digest = slide_digest(inputs, files=[missing])
+    assert slide_digest(inputs, files=[missing]) == digest
+
+    # The font appearing later changes the digest, so the slide is redrawn with it
+    write(missing, b"bold")
+    assert slide_digest(inputs, files=[missing]) != digest
+
+def test_manifest_reuses_current_slides_and_removes_stale_ones(tmp_path):
+    story_dir = str(tmp_path)
+    kept = write(tmp_path / "output_1.jpg", b"jpg")
+    stale = write(tmp_path / "output_2.jpg", b"jpg")
+    manifest = RenderManifest(story_dir)
+    manifest.record(kept, "a")
+    manifest.record(stale, "b")
+    manifest.save()
+
+    manifest = RenderManifest(story_dir)
+    assert manifest.is_current(kept, "a")
+    assert not RenderManifest(story_dir).is_current(kept, "changed")
+    manifest.save()
+    assert os.path.exists(kept)
+    assert not os.path.exists(stale)
@@ -0,0 +1,107 @@
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import storage
+from storage import compact_frame, convert_csv, load_dataset, save_dataset, write_records
+
+COLUMNS = ["Country", "Story"]
+
+def records(n):
+    return [{"Country": "Kenya" if i % 2 else "India", "Story": f"story {i}"} for i in range(n)]
+
+def test_load_dataset_nrows_spans_small_row_groups(tmp_path):
+    path = str(tmp_path / "stories.parquet")
+    write_records(records(25), path, COLUMNS, batch_size=4)
+    assert pq.ParquetFile(path).num_row_groups == 7
+
+    for nrows in (1, 4, 10, 25):
+        df = load_dataset(path, nrows=nrows)
+        assert df["Story"].tolist() == [f"story {i}" for i in range(nrows)]
+    assert len(load_dataset(path, nrows=100)) == 25
+
+def test_load_dataset_nrows_with_projection_and_empty_file(tmp_path):
+    path = str(tmp_path / "stories.parquet")
+    write_records(records(10), path, COLUMNS, batch_size=3)
+    df = load_dataset(path, columns=["Story"], nrows=5)
+    assert df.columns.tolist() == ["Story"]
+    assert len(df) == 5
+
+    empty = str(tmp_path / "empty.parquet")
+    write_records([], empty, COLUMNS)
+    assert load_dataset(empty, columns=["Story"], nrows=3).columns.tolist() == ["Story"]
+
+@pytest.fixture
+def read_csv_calls(monkeypatch):
+    calls = []
+    read_csv = pd.read_csv
+
+    def counting_read_csv(*args, **kwargs):
+        calls.append(args)
+        return read_csv(*args, **kwargs)
+
+    monkeypatch.setattr(storage.pd, "read_csv", counting_read_csv)
+    return calls
+
+def test_load_dataset_prefers_current_parquet_copy(tmp_path, read_csv_calls):
+    path = str(tmp_path / "stories.csv")
+    save_dataset(pd.DataFrame(records(6)), path)
+    df = load_dataset(path, columns=["Story"], nrows=4)
+    assert read_csv_calls == []
+    assert df["Story"].tolist() == [f"story {i}" for i in range(4)]
+
+    convert_csv(path)
+    read_csv_calls.clear()
+    assert len(load_dataset(path)) == 6
+    assert read_csv_calls == []
+
+def test_load_dataset_reads_csv_edited_after_parquet_copy(tmp_path, read_csv_calls):
+    path = str(tmp_path / "stories.csv")
+    save_dataset(pd.DataFrame(records(6)), path)
+    pd.DataFrame(records(3)).to_csv(path, index=False)
+    # Same modification time as the copy, so only the recorded size tells them apart
+    parquet_mtime = os.stat(storage.parquet_path(path)).st_mtime_ns
+    os.utime(path, ns=(parquet_mtime, parquet_mtime))
+
+    assert len(load_dataset(path)) == 3
+    assert len(read_csv_calls) == 1
+
+def test_load_dataset_csv_fallback_honours_nrows(tmp_path):
+    path = str(tmp_path / "stories.csv")
+    pd.DataFrame(records(6)).to_csv(path, index=False)
+    assert len(load_dataset(path, nrows=3)) == 3
+
+def test_compact_frame_leaves_columns_that_do_not_fit():
+    df = pd.DataFrame({
+        "Country": ["Kenya", "India"],
+        "Themes": [["Workplace"], ["Domestic"]],
+        "Year": [2018.0, None],
+        "There is legislation (1=yes; 0=no)": [1.0, 0.5],
+        "Share (% of women)": [21.5, 30.0],
+    })
+    dtypes = compact_frame(df).dtypes
+    assert isinstance(dtypes["Country"], pd.CategoricalDtype)
+    assert dtypes["Themes"] == object
+    assert dtypes["Year"] == "Int16"
+    assert dtypes["There is legislation (1=yes; 0=no)"] == "float64"
+    assert dtypes["Share (% of women)"] == "float32"
+
+def test_write_records_types_columns_from_fieldnames(tmp_path):
+    path = str(tmp_path / "stories.parquet")
+    rows = [{"Country": None, "Story": "first", "Cluster": None}] * 3 + [{"Country": "Kenya", "Story": "later", "Cluster": 2}]
+    assert write_records(rows, path, ["Country", "Story", "Cluster"], {"Cluster": "int8"}, batch_size=3) == 4
+    schema = pq.read_schema(path)
+    assert [str(t) for t in schema.types] == ["string", "string", "int8"]
+    assert pd.read_parquet(path)["Country"].tolist()[-1] == "Kenya"
+
+@pytest.mark.parametrize("name", ["stories.parquet", "stories.csv"])
+def test_write_records_leaves_nothing_behind_on_error(tmp_path, name):
+    def failing_records():
+        yield from records(5)
+        raise RuntimeError("source went away")
+
+    with pytest.raises(RuntimeError):
+        write_records(failing_records(), str(tmp_path / name), COLUMNS, batch_size=2)
+    assert list(tmp_path.iterdir()) == []
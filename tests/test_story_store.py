@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from story_store import StoryStore
+
+@pytest.fixture
+def store(tmp_path):
+    store = StoryStore(str(tmp_path / "stories.sqlite3"))
+    yield store
+    store.close()
+
+def test_upsert_keeps_values_the_new_record_lacks(store):
+    store.upsert([{"Story": "My boss  paid him more.", "Country": "Kenya", "Title": "Pay gap"}], source="a.csv")
+    # Same story with different whitespace, without a Title but with a Cluster
+    assert store.upsert([{"Story": "My boss paid him more.", "Country": None, "Cluster": 4}], source="b.csv") == 1
+    assert store.count() == 1
+    row = store.find("My boss paid him more.")
+    assert (row["Country"], row["Title"], row["Cluster"], row["source"]) == ("Kenya", "Pay gap", 4, "b.csv")
+
+def test_upsert_skips_records_without_a_story(store):
+    assert store.upsert([{"Story": None}, {"Story": "  "}, {"Title": "no story"}, {"Story": "kept"}]) == 1
+
+def test_full_text_index_follows_inserts_updates_and_deletes(store):
+    store.upsert([{"Story": "The salaries were never published."}, {"Story": "We stood on the bus."}])
+    salaries = store.find("The salaries were never published.")["id"]
+    assert [row["id"] for row in store.search("salary")] == [salaries]
+
+    store.update(salaries, Story="The wages were never published.")
+    assert store.search("salary") == []
+    assert [row["id"] for row in store.search("wage")] == [salaries]
+
+    store.delete(salaries)
+    assert store.search("wage") == []
+    store.rebuild_index()
+    assert [row["Story"] for row in store.search("bus")] == ["We stood on the bus."]
+
+def test_search_neutralises_query_syntax(store):
+    store.upsert([{"Story": "She said: NOT tonight (or ever)."}])
+    assert len(store.search('NOT tonight" (or')) == 1
+    assert store.search("!!!") == []
+
+def test_update_to_an_existing_story_raises_value_error(store):
+    store.upsert([{"Story": "first story"}, {"Story": "second story"}])
+    second = store.find("second story")["id"]
+    with pytest.raises(ValueError, match="cannot take the text"):
+        store.update(second, Story="first  story")
+    assert store.get(second)["Story"] == "second story"
+    with pytest.raises(ValueError, match="Unknown story columns"):
+        store.update(second, Headline="x")
+
+def test_csv_round_trip(store, tmp_path):
+    source = tmp_path / "stories.csv"
+    pd.DataFrame({
+        "Country": ["Kenya", "India", "Kenya"],
+        "Story": ["one", "two", "one"],
+        "Title": ["First", None, None],
+        "Cluster": [1, None, 1],
+        "Extra": ["ignored", "ignored", "ignored"],
+    }).to_csv(source, index=False)
+    assert store.import_csv(str(source), chunksize=2) == 3
+    assert store.count() == 2
+
+    exported = tmp_path / "export.csv"
+    assert store.export_csv(str(exported)) == 2
+    df = pd.read_csv(exported)
+    assert df.columns.tolist() == ["Country", "Story", "Title", "Caption", "Themes", "Cluster"]
+    assert df["Story"].tolist() == ["one", "two"]
+    assert df["Title"].tolist()[0] == "First"
+    assert store.to_frame(country="India")["Story"].tolist() == ["two"]
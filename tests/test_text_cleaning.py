@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+from text_cleaning import clean_csv
+
+def test_clean_csv_reads_mixed_utf8_and_cp1252(tmp_path):
+    source = tmp_path / "mixed.csv"
+    source.write_bytes(
+        b"Country,Story\r\n"
+        + "Perú,José said it’s fine\r\n".encode("utf-8")
+        + b"India,I was told to be \x93ladylike\x94\x97so I stayed quiet\r\n"
+        + b"Kenya,\"a stray byte ''\x9d, here\"\r\n"
+        + "Spain,donâ€™t\r\n".encode("utf-8")
+    )
+    output = tmp_path / "cleaned.csv"
+
+    assert clean_csv(str(source), str(output)) == 4
+    df = pd.read_csv(output, encoding="utf-8")
+    assert df["Country"].tolist() == ["Perú", "India", "Kenya", "Spain"]
+    assert df["Story"].tolist() == [
+        "José said it's fine",
+        'I was told to be "ladylike"-so I stayed quiet',
+        "a stray byte ''�, here",
+        "don't",
+    ]
+
+def test_clean_csv_failure_leaves_no_output(tmp_path):
+    output = tmp_path / "cleaned.csv"
+    with pytest.raises(FileNotFoundError):
+        clean_csv(str(tmp_path / "missing.csv"), str(output))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+import text_layout
+from text_layout import layout_text, word_width
+
+FONT_FILE = os.path.join(os.path.dirname(__file__), "..", "ig_linked_db.py", "Baloo_2", "static", "Baloo2-Regular.ttf")
+
+class FakeFont:
+    """Monospaced stand-in: every character is 10 pixels wide. Counts measurements."""
+
+    def __init__(self, path=None, size=10):
+        self.path = path
+        self.size = size
+        self.measured = 0
+
+    def getlength(self, text):
+        self.measured += 1
+        return 10 * len(text)
+
+    def getbbox(self, text):
+        self.measured += 1
+        return (0, 0, 10 * len(text), 12)
+
+@pytest.fixture(autouse=True)
+def empty_caches(monkeypatch):
+    monkeypatch.setattr(text_layout, "_WORD_WIDTHS", text_layout.OrderedDict())
+    monkeypatch.setattr(text_layout, "_LINE_WIDTHS", {})
+    monkeypatch.setattr(text_layout, "_LAYOUTS", {})
+
+def test_word_widths_are_cached_per_font_file_and_size():
+    font = FakeFont("a.ttf")
+    word_width(font, "word")
+    # Another object loaded from the same file and size shares the entry
+    same = FakeFont("a.ttf")
+    assert word_width(same, "word") == 40
+    assert same.measured == 0
+    word_width(FakeFont("a.ttf", size=20), "word")
+    assert len(text_layout._WORD_WIDTHS) == 2
+
+def test_word_width_cache_evicts_least_recently_used(monkeypatch):
+    monkeypatch.setattr(text_layout, "MAX_CACHED_WORDS", 2)
+    font = FakeFont("a.ttf")
+    word_width(font, "one")
+    word_width(font, "two")
+    word_width(font, "one")
+    word_width(font, "three")
+    assert [word for _, word in text_layout._WORD_WIDTHS] == ["one", "three"]
+
+def test_fonts_without_a_file_are_not_cached():
+    font = FakeFont(path=None)
+    first = layout_text("a few short words", font, 100)
+    assert layout_text("a few short words", font, 100) is not first
+    assert not text_layout._WORD_WIDTHS and not text_layout._LINE_WIDTHS and not text_layout._LAYOUTS
+
+def naive_lines(text, font, max_width):
+    """The per-word wrapping draw_wrapped_text used before the layout module."""
+    lines, current = [], []
+    for word in text.split():
+        bbox = font.getbbox(" ".join(current + [word]))
+        if current and bbox[2] - bbox[0] > max_width:
+            lines.append(" ".join(current))
+            current = [word]
+        else:
+            current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+def test_layout_matches_measuring_every_prefix():
+    ImageFont = pytest.importorskip("PIL.ImageFont")
+    font = ImageFont.truetype(FONT_FILE, 30)
+    text = ("When I asked why my colleague was paid more for the same job, I was told he had a family "
+            "to support, as if I did not. Extraordinarily-long-hyphenated-words-still-fit somewhere.")
+    for max_width in (120, 300, 540, 900):
+        layout = layout_text(text, font, max_width, line_spacing=8)
+        assert layout.lines == naive_lines(text, font, max_width)
+        assert layout.total_height == len(layout.lines) * layout.line_height
@@ -0,0 +1,59 @@
+import pytest
+
+import translation
+from llm_client import SQLiteResponseCache
+from translation import EchoBackend, TranslationStage
+
+class CountingBackend(EchoBackend):
+    """EchoBackend that records every batch it is sent, and fails on texts containing 'bad'."""
+
+    def __init__(self):
+        super().__init__(prefix="en:")
+        self.batches = []
+
+    def translate(self, texts, dest):
+        self.batches.append(list(texts))
+        if any("bad" in text for text in texts):
+            raise RuntimeError("backend error")
+        return super().translate(texts, dest)
+
+@pytest.fixture
+def detections(monkeypatch):
+    """Replace langdetect: texts starting with 'Hello' are English. Returns the texts checked."""
+    checked = []
+
+    def english_mask(texts):
+        checked.extend(texts)
+        return [text.startswith("Hello") for text in texts]
+
+    monkeypatch.setattr(translation, "english_mask", english_mask)
+    return checked
+
+def make_stage(tmp_path, backend):
+    cache = SQLiteResponseCache(str(tmp_path / "cache.sqlite3"))
+    return TranslationStage(backend, cache, batch_size=10, max_retries=0, base_delay=0)
+
+def test_translates_each_distinct_text_once(tmp_path, detections):
+    backend = CountingBackend()
+    texts = ["bonjour", "Hello", "bonjour", None, "  ", "merci"]
+    translations, stats = make_stage(tmp_path, backend).translate_texts(texts)
+    assert translations == ["en:bonjour", "Hello", "en:bonjour", None, "  ", "en:merci"]
+    assert backend.batches == [["bonjour", "merci"]]
+    assert (stats.unique, stats.english, stats.translated) == (3, 1, 2)
+
+def test_rerun_is_served_entirely_from_cache(tmp_path, detections):
+    backend = CountingBackend()
+    make_stage(tmp_path, backend).translate_texts(["bonjour", "Hello"])
+    detections.clear()
+    backend.batches.clear()
+
+    translations, stats = make_stage(tmp_path, backend).translate_texts(["bonjour", "Hello"])
+    assert translations == ["en:bonjour", "Hello"]
+    assert stats.cached == 2
+    assert detections == []
+    assert backend.batches == []
+
+def test_failing_text_is_reported_without_failing_its_batch(tmp_path, detections):
+    translations, stats = make_stage(tmp_path, CountingBackend()).translate_texts(["bonjour", "bad", "merci"])
+    assert translations == ["en:bonjour", "bad", "en:merci"]
+    assert list(stats.failed) == ["bad"]
@@ -0,0 +1,131 @@
+import json
+import threading
+
+import pytest
+
+from uploader import DryRunClient, InstagramSession, TokenBucket, UploadWorker, make_upload_queue
+
+class FakeClock:
+    """Clock whose sleep advances time instantly and records how long it was asked to wait."""
+
+    def __init__(self):
+        self.now = 100.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+class FlakyClient(DryRunClient):
+    """DryRunClient whose first failures uploads raise."""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+        self.attempts = 0
+
+    def album_upload(self, paths, caption=""):
+        self.attempts += 1
+        if self.attempts <= self.failures:
+            raise ConnectionError("upload refused")
+        return super().album_upload(paths, caption)
+
+class NoLimit:
+    def __init__(self):
+        self.acquired = 0
+
+    def acquire(self):
+        self.acquired += 1
+
+def test_token_bucket_spaces_acquisitions_at_its_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=1, clock=clock, sleep=clock.sleep)
+    for _ in range(3):
+        bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5]
+
+    # Idle time refills up to capacity only
+    clock.now += 60
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == [0.5, 0.5, 0.5]
+
+def test_token_bucket_allows_a_burst_of_capacity():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=0.25, capacity=3, clock=clock, sleep=clock.sleep)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.sleeps == [4.0]
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+def test_session_persists_settings_and_logs_in_once(tmp_path):
+    settings = tmp_path / "session.json"
+    clients = []
+
+    def factory():
+        clients.append(DryRunClient())
+        return clients[-1]
+
+    session = InstagramSession("user", "secret", settings_path=str(settings), client_factory=factory)
+    assert session.login() is session.login()
+    session.upload(["a.png", "b.png"], "first")
+    session.upload(["c.png"], "second")
+    assert len(clients) == 1
+    assert clients[0].uploads == [(["a.png", "b.png"], "first"), (["c.png"], "second")]
+    assert json.loads(settings.read_text()) == {}
+
+    # A new run restores the saved settings before logging in
+    InstagramSession("user", "secret", settings_path=str(settings), client_factory=factory).login()
+    assert clients[1].settings == {"loaded_from": str(settings)}
+
+def run_worker(client, items, max_retries=2):
+    session = InstagramSession("user", "secret", client_factory=lambda: client)
+    upload_queue = make_upload_queue(maxsize=1)
+    limiter = NoLimit()
+    sleeps = []
+    worker = UploadWorker(upload_queue, session, limiter, max_retries=max_retries, sleep=sleeps.append)
+    worker.start()
+    for item in items:
+        upload_queue.put(item)
+    upload_queue.put(None)
+    worker.join(timeout=5)
+    assert not worker.is_alive()
+    return worker, limiter, sleeps
+
+def test_worker_retries_a_failed_upload():
+    client = FlakyClient(failures=2)
+    worker, limiter, sleeps = run_worker(client, [(7, ["a.png", "b.png"], "caption")])
+    assert worker.posted == [7]
+    assert worker.failed == []
+    assert client.attempts == 3
+    # Every attempt waits for the rate limiter; backoff doubles (with up to 50% jitter)
+    assert limiter.acquired == 3
+    assert len(sleeps) == 2 and 15 <= sleeps[0] <= 30 and 30 <= sleeps[1] <= 60
+
+def test_worker_records_failure_after_last_retry_and_continues():
+    client = FlakyClient(failures=3)
+    items = [(1, ["a.png", "b.png"], "first"), (2, ["c.png", "d.png"], "second")]
+    worker, _, _ = run_worker(client, items, max_retries=1)
+    assert worker.failed == [1]
+    assert worker.posted == [2]
+
+def test_worker_drains_the_bounded_queue_and_stops_on_none():
+    client = DryRunClient()
+    items = [(i, ["a.png", "b.png"], f"story {i}") for i in range(5)]
+    done = threading.Event()
+
+    def produce():
+        # put blocks while the single queue slot is taken, so this only finishes if the worker keeps up
+        worker, _, _ = run_worker(client, items)
+        assert worker.posted == list(range(5))
+        done.set()
+
+    producer = threading.Thread(target=produce)
+    producer.start()
+    producer.join(timeout=5)
+    assert done.is_set()
+    assert [caption for _, caption in client.uploads] == [f"story {i}" for i in range(5)]